@@ -0,0 +1,56 @@
+import logging
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+
+from .instrumentation import count_queries, fingerprint
+
+logger = logging.getLogger('core.budget')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryLog:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def report(self):
+        """SQL, сгруппированный по шаблону: N+1 виден как один частый."""
+        counts = Counter(map(fingerprint, self.queries))
+        return '\n'.join(
+            f'{count} × {sql}' for sql, count in counts.most_common()
+        )
+
+
+def query_budget(limit):
+    """Ограничивает число SQL-запросов view.
+
+    При превышении в DEBUG и тестах (``QUERY_BUDGET_STRICT``) бросает
+    QueryBudgetExceeded, иначе пишет предупреждение в лог.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            log = QueryLog()
+            with count_queries(log):
+                response = view(request, *args, **kwargs)
+            if len(log.queries) > limit:
+                message = (
+                    f'{view.__module__}.{view.__name__}: '
+                    f'{len(log.queries)} SQL-запросов при бюджете {limit}\n'
+                    f'{log.report()}'
+                )
+                if settings.QUERY_BUDGET_STRICT:
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+            return response
+        return wrapper
+    return decorator
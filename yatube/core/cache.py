@@ -0,0 +1,44 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = 'version:{scope}'
+
+
+def _version_key(scope):
+    return VERSION_KEY.format(scope=hashlib.md5(scope.encode()).hexdigest())
+
+
+def get_versions(scopes):
+    """Текущие версии областей кеша в порядке ``scopes``.
+
+    Ключ с версией входит в ключ закешированного значения, поэтому
+    ``invalidate`` сбрасывает все значения области одним incr.
+    """
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Версия начинается со времени, а не с нуля: если ключ
+            # вытеснят, старые значения не станут снова актуальными.
+            cache.add(key, int(time.time() * 1000), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*scopes):
+    for scope in set(scopes):
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, int(time.time() * 1000), None)
+
+
+def invalidate_on_commit(*scopes):
+    invalidate(*scopes)
+    # Повтор после коммита сбрасывает значения, которые другие запросы
+    # успели закешировать, пока транзакция не была зафиксирована.
+    transaction.on_commit(lambda: invalidate(*scopes))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sqlite_benchmark import run_benchmark
+from posts.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает конкурентное чтение и запись в копии базы '
+        'с настройками SQLite по умолчанию и с SQLITE_PRAGMAS'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--duration', type=float, default=5,
+                            help='Длительность замера профиля, секунд')
+
+    def handle(self, *args, **options):
+        if not User.objects.exists():
+            raise CommandError(
+                'База пуста, сначала заполните её командой seed_yatube'
+            )
+        results = run_benchmark(
+            options['readers'], options['writers'], options['duration']
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name}: чтений/с {result["reads_per_s"]}, '
+                f'записей/с {result["writes_per_s"]}, '
+                f'ошибок {result["errors"]}'
+            )
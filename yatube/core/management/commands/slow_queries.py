@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.slow_queries import aggregate, get_log_paths, read_log
+
+ORDERINGS = ('total', 'max', 'count')
+
+
+class Command(BaseCommand):
+    help = 'Сводка медленных SQL-запросов из лога по шаблонам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=settings.SLOW_QUERY_LOG,
+                            help='Файл лога медленных запросов')
+        parser.add_argument('--order-by', choices=ORDERINGS,
+                            default='total')
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, *args, **options):
+        groups = aggregate(read_log(get_log_paths(options['log'])))
+        if not groups:
+            self.stdout.write('Медленных запросов нет')
+            return
+        groups.sort(key=lambda group: getattr(group, options['order_by']),
+                    reverse=True)
+        for group in groups[:options['limit']]:
+            views = ', '.join(
+                f'{view or "—"} ({count})'
+                for view, count in group.views.most_common()
+            )
+            self.stdout.write(self.style.WARNING(
+                f'{group.count} × всего {group.total:.1f} мс, '
+                f'макс. {group.max:.1f} мс, '
+                f'сред. {group.average:.1f} мс'
+            ))
+            self.stdout.write(f'  SQL: {group.fingerprint}')
+            self.stdout.write(f'  View: {views}')
+            for step in group.plan or ():
+                self.stdout.write(f'  План: {step}')
@@ -0,0 +1,293 @@
+import atexit
+import fcntl
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10,
+)
+SIZE_BUCKETS = (
+    1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+)
+QUERIES_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Снимок процесса: pid и время запуска, чтобы повторно выданный pid
+# не перезаписал итоги завершившегося воркера.
+SNAPSHOT_NAME = re.compile(r'^(\d+)(?:-\d+)?\.json$')
+AGGREGATE_FILE = 'aggregate.json'
+LOCK_FILE = '.lock'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return (
+        str(value).replace('\\', r'\\').replace('\n', r'\n')
+        .replace('"', r'\"')
+    )
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_json(path, default):
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data):
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(temp_path, path)
+
+
+def _add_snapshot(totals, snapshot):
+    for family, name, labels, value in snapshot:
+        key = (family, name, tuple(tuple(pair) for pair in labels))
+        totals[key] += value
+
+
+def _to_snapshot(totals):
+    return [
+        [family, name, [list(pair) for pair in labels], value]
+        for (family, name, labels), value in totals.items()
+    ]
+
+
+def _sample_order(sample):
+    name, labels, _ = sample
+    bound = dict(labels).get('le')
+    return (
+        tuple(pair for pair in labels if pair[0] != 'le'),
+        name,
+        float(bound) if bound else 0,
+    )
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, registry, name, documentation):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+
+    def inc(self, amount=1, **labels):
+        self.registry.add(self.name, self.name, labels, amount)
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, buckets):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        # Бакеты хранятся сразу накопленными: так снимки процессов
+        # складываются простым суммированием.
+        samples = [
+            (
+                f'{self.name}_bucket',
+                {**labels, 'le': _format_value(bound)},
+                int(value <= bound),
+            )
+            for bound in self.buckets
+        ]
+        samples.append((f'{self.name}_sum', labels, value))
+        samples.append((f'{self.name}_count', labels, 1))
+        self.registry.add_many(self.name, samples)
+
+
+class Registry:
+    """Метрики процесса в формате Prometheus.
+
+    Каждый процесс держит значения в памяти и раз в
+    ``METRICS_FLUSH_INTERVAL`` секунд сохраняет снимок в свой файл
+    в ``METRICS_DIR``. Эндпоинт складывает снимки всех процессов,
+    поэтому данные других воркеров отстают не больше чем на интервал.
+    Снимки завершившихся процессов переносятся в общий файл итогов,
+    чтобы счётчики не уменьшались и файлы не копились.
+    """
+
+    def __init__(self):
+        self.families = {}
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.samples = defaultdict(float)
+        self.pid = os.getpid()
+        self.started = int(time.time() * 1000)
+        self.flushed = time.monotonic()
+
+    def counter(self, name, documentation):
+        return self._register(Counter(self, name, documentation))
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(self, name, documentation, buckets))
+
+    def _register(self, metric):
+        self.families[metric.name] = metric
+        return metric
+
+    def add(self, family, name, labels, amount):
+        self.add_many(family, [(name, labels, amount)])
+
+    def add_many(self, family, samples):
+        with self.lock:
+            self._check_pid()
+            for name, labels, amount in samples:
+                key = (family, name, tuple(sorted(labels.items())))
+                self.samples[key] += amount
+
+    def _check_pid(self):
+        if self.pid != os.getpid():
+            # После fork значения родителя уже есть в его файле.
+            self.reset()
+
+    @staticmethod
+    def get_directory():
+        return getattr(settings, 'METRICS_DIR', None)
+
+    def get_path(self, directory):
+        return os.path.join(directory, f'{self.pid}-{self.started}.json')
+
+    def snapshot(self):
+        with self.lock:
+            self._check_pid()
+            return [
+                [family, name, list(labels), value]
+                for (family, name, labels), value in self.samples.items()
+            ]
+
+    def maybe_flush(self):
+        interval = settings.METRICS_FLUSH_INTERVAL
+        if time.monotonic() - self.flushed >= interval:
+            self.flush()
+
+    def flush(self):
+        directory = self.get_directory()
+        self.flushed = time.monotonic()
+        if not directory:
+            return
+        snapshot = self.snapshot()
+        os.makedirs(directory, exist_ok=True)
+        _write_json(self.get_path(directory), snapshot)
+
+    def merge_dead(self, directory):
+        """Переносит снимки завершившихся процессов в файл итогов.
+
+        Вызывается под блокировкой каталога. В итогах запоминаются
+        перенесённые файлы: если процесс упадёт между записью итогов
+        и удалением снимков, они не сложатся дважды.
+        """
+        dead = []
+        for filename in os.listdir(directory):
+            match = SNAPSHOT_NAME.match(filename)
+            if match and not _is_alive(int(match.group(1))):
+                dead.append(filename)
+        if not dead:
+            return
+        path = os.path.join(directory, AGGREGATE_FILE)
+        aggregate = _read_json(path, {'samples': [], 'merged': []})
+        totals = defaultdict(float)
+        _add_snapshot(totals, aggregate['samples'])
+        for filename in dead:
+            if filename not in aggregate['merged']:
+                _add_snapshot(totals, _read_json(
+                    os.path.join(directory, filename), []
+                ))
+        _write_json(path, {'samples': _to_snapshot(totals), 'merged': dead})
+        for filename in dead:
+            os.remove(os.path.join(directory, filename))
+
+    def collect(self):
+        """Суммирует итоги, снимки всех процессов и значения текущего."""
+        totals = defaultdict(float)
+        _add_snapshot(totals, self.snapshot())
+        directory = self.get_directory()
+        if not directory or not os.path.isdir(directory):
+            return totals
+        own = os.path.basename(self.get_path(directory))
+        # Под блокировкой другой сборщик не удалит снимок, пока его
+        # значения ещё не попали в прочитанные итоги.
+        with open(os.path.join(directory, LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.merge_dead(directory)
+            _add_snapshot(totals, _read_json(
+                os.path.join(directory, AGGREGATE_FILE), {'samples': []}
+            )['samples'])
+            for filename in os.listdir(directory):
+                if SNAPSHOT_NAME.match(filename) and filename != own:
+                    _add_snapshot(totals, _read_json(
+                        os.path.join(directory, filename), []
+                    ))
+        return totals
+
+    def render(self):
+        totals = self.collect()
+        lines = []
+        for family, metric in self.families.items():
+            lines.append(f'# HELP {family} {metric.documentation}')
+            lines.append(f'# TYPE {family} {metric.type}')
+            samples = sorted(
+                (
+                    (name, labels, value)
+                    for (owner, name, labels), value in totals.items()
+                    if owner == family
+                ),
+                key=_sample_order,
+            )
+            for name, labels, value in samples:
+                if labels:
+                    name += '{' + ','.join(
+                        f'{label}="{_escape(text)}"' for label, text in labels
+                    ) + '}'
+                lines.append(f'{name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+REQUESTS = registry.counter(
+    'yatube_http_requests_total', 'Количество запросов по view.'
+)
+LATENCY = registry.histogram(
+    'yatube_http_request_duration_seconds', 'Время ответа view.'
+)
+RESPONSE_SIZE = registry.histogram(
+    'yatube_http_response_size_bytes', 'Размер тела ответа.', SIZE_BUCKETS
+)
+DB_QUERIES = registry.histogram(
+    'yatube_db_queries_per_request', 'Число SQL-запросов на запрос.',
+    QUERIES_BUCKETS,
+)
+FEED_CACHE = registry.counter(
+    'yatube_feed_cache_requests_total', 'Обращения к кешу лент.'
+)
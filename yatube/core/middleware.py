@@ -0,0 +1,93 @@
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+
+from . import metrics
+from .instrumentation import (RequestStats, count_queries, current_request,
+                              current_stats)
+
+logger = logging.getLogger('core.instrumentation')
+
+SLOWEST_SQL_LENGTH = 300
+METRICS_NAMESPACES = ('posts', 'users', 'about')
+
+
+class MetricsMiddleware:
+    """Собирает метрики запросов к view приложений posts, users и about."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = current_request.set(request)
+        started = time.perf_counter()
+        try:
+            with count_queries(stats):
+                response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        if match and match.namespace in METRICS_NAMESPACES:
+            self.record(match.view_name, request, response, stats, duration)
+        metrics.registry.maybe_flush()
+        return response
+
+    def record(self, view, request, response, stats, duration):
+        metrics.REQUESTS.inc(
+            view=view, method=request.method, status=response.status_code
+        )
+        metrics.LATENCY.observe(duration, view=view)
+        metrics.DB_QUERIES.observe(stats.queries, view=view)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), view=view)
+
+
+class InstrumentationMiddleware:
+    """Замеряет SQL, рендеринг и время view у выборки запросов.
+
+    Результат пишется в лог одной JSON-строкой и в заголовок
+    Server-Timing. Запросы вне выборки обходятся одним вызовом random().
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:
+            return self.get_response(request)
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with count_queries(stats):
+                response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        total_time = time.perf_counter() - started
+        self.report(request, response, stats, total_time)
+        return response
+
+    def report(self, request, response, stats, total_time):
+        match = request.resolver_match
+        record = {
+            'view': match.view_name if match else None,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': stats.queries,
+            'sql_ms': round(stats.sql_time * 1000, 3),
+            'slowest_sql_ms': round(stats.slowest_time * 1000, 3),
+            'slowest_sql': (stats.slowest_sql or '')[:SLOWEST_SQL_LENGTH],
+            'render_ms': round(stats.render_time * 1000, 3),
+            'total_ms': round(total_time * 1000, 3),
+        }
+        logger.info(json.dumps(record, ensure_ascii=False))
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={record["sql_ms"]};desc="{stats.queries} queries"',
+            f'render;dur={record["render_ms"]}',
+            f'total;dur={record["total_ms"]}',
+        ))
@@ -0,0 +1,307 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MAGIC = b'YTC1'
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+# magic, число слотов, размер области данных, часы LRU,
+# конец занятой области данных, число записей.
+HEADER = struct.Struct('=4sIQQQQ')
+# хеш ключа, смещение, длина, срок жизни, последнее обращение, состояние.
+SLOT = struct.Struct('=QQIdQB')
+KEY_LENGTH = struct.Struct('=H')
+EMPTY, USED, DELETED = 0, 1, 2
+
+# Django создаёт экземпляр бэкенда в каждом потоке, а файл, отображение
+# и блокировка потоков у процесса одни: иначе каждый поток оставлял бы
+# открытый дескриптор.
+_opened = {}
+_opened_lock = threading.Lock()
+
+
+def _hash(key):
+    return int.from_bytes(hashlib.md5(key).digest()[:8], 'little')
+
+
+class MmapCache(BaseCache):
+    """Кеш в файле, отображённом в память всех процессов хоста.
+
+    Файл состоит из заголовка, хеш-таблицы слотов с открытой адресацией
+    и области данных, куда записи дописываются подряд. Когда область
+    данных или таблица заполнены, вытесняются давно не читанные
+    и просроченные записи, а оставшиеся сдвигаются к началу.
+    Процессы согласуются через flock, потоки — через Lock.
+
+    OPTIONS: MAX_SIZE — размер области данных в байтах, MAX_ENTRIES
+    и CULL_FREQUENCY — как у остальных бэкендов Django.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = location
+        self.data_size = int(options.get('MAX_SIZE', DEFAULT_MAX_SIZE))
+        self.slots = self._max_entries * 2
+        self.data_start = HEADER.size + self.slots * SLOT.size
+        self.file_size = self.data_start + self.data_size
+        self._pid = None
+
+    def _open(self):
+        # После fork дескриптор надо открыть заново: flock на общем
+        # с родителем описании файла не разделял бы процессы.
+        if self._pid == os.getpid():
+            return
+        key = (os.getpid(), self.path, self.slots, self.data_size)
+        with _opened_lock:
+            if key not in _opened:
+                _opened[key] = self._map_file()
+            self._fd, self._map, self._lock = _opened[key]
+        self._pid = os.getpid()
+
+    def _map_file(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            fresh = os.fstat(self._fd).st_size != self.file_size
+            if fresh:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self.file_size)
+            self._map = mmap.mmap(self._fd, self.file_size)
+            magic, slots, data_size = HEADER.unpack_from(self._map)[:3]
+            if (magic, slots, data_size) != (
+                MAGIC, self.slots, self.data_size
+            ):
+                self._reset()
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return self._fd, self._map, threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        self._open()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _reset(self):
+        self._map[:self.data_start] = bytes(self.data_start)
+        self._write_header(tick=0, used=0, count=0)
+
+    def _read_header(self):
+        _, _, _, tick, used, count = HEADER.unpack_from(self._map)
+        return tick, used, count
+
+    def _write_header(self, tick, used, count):
+        HEADER.pack_into(
+            self._map, 0, MAGIC, self.slots, self.data_size,
+            tick, used, count,
+        )
+
+    def _read_slot(self, index):
+        return SLOT.unpack_from(self._map, HEADER.size + index * SLOT.size)
+
+    def _write_slot(self, index, *slot):
+        SLOT.pack_into(self._map, HEADER.size + index * SLOT.size, *slot)
+
+    def _read_payload(self, offset, length):
+        start = self.data_start + offset
+        return self._map[start:start + length]
+
+    def _split(self, payload):
+        """Делит запись на ключ и значение."""
+        (key_length,) = KEY_LENGTH.unpack_from(payload)
+        middle = KEY_LENGTH.size + key_length
+        return payload[KEY_LENGTH.size:middle], payload[middle:]
+
+    def _find(self, key):
+        """Возвращает индекс слота ключа или None и первый свободный."""
+        key_hash = _hash(key)
+        free = None
+        for step in range(self.slots):
+            index = (key_hash + step) % self.slots
+            slot_hash, offset, length, _, _, state = self._read_slot(index)
+            if state == EMPTY:
+                return None, index if free is None else free
+            if state == DELETED:
+                if free is None:
+                    free = index
+            elif slot_hash == key_hash and self._split(
+                self._read_payload(offset, length)
+            )[0] == key:
+                return index, free
+        return None, free
+
+    def _get_live(self, key):
+        index, _ = self._find(key)
+        if index is None:
+            return None
+        expires = self._read_slot(index)[3]
+        if expires and expires <= time.time():
+            self._delete_slot(index)
+            return None
+        return index
+
+    def _delete_slot(self, index):
+        self._write_slot(index, 0, 0, 0, 0, 0, DELETED)
+        tick, used, count = self._read_header()
+        self._write_header(tick, used, count - 1)
+
+    def _touch_slot(self, index):
+        slot = list(self._read_slot(index))
+        tick, used, count = self._read_header()
+        slot[4] = tick + 1
+        self._write_slot(index, *slot)
+        self._write_header(tick + 1, used, count)
+
+    def _expires(self, timeout):
+        expires = self.get_backend_timeout(timeout)
+        return 0.0 if expires is None else expires
+
+    def _store(self, key, value, expires):
+        payload = KEY_LENGTH.pack(len(key)) + key + value
+        if len(payload) > self.data_size:
+            return False
+        index, _ = self._find(key)
+        if index is not None:
+            self._delete_slot(index)
+        _, used, count = self._read_header()
+        if (
+            used + len(payload) > self.data_size
+            or count >= self._max_entries
+        ):
+            self._compact(len(payload))
+        _, free = self._find(key)
+        tick, used, count = self._read_header()
+        start = self.data_start + used
+        self._map[start:start + len(payload)] = payload
+        self._write_slot(
+            free, _hash(key), used, len(payload), expires, tick + 1, USED
+        )
+        self._write_header(tick + 1, used + len(payload), count + 1)
+        return True
+
+    def _compact(self, needed):
+        """Вытесняет старые записи и сдвигает остальные к началу."""
+        now = time.time()
+        live = []
+        for index in range(self.slots):
+            slot = self._read_slot(index)
+            if slot[5] == USED and not (slot[3] and slot[3] <= now):
+                live.append(slot)
+        live.sort(key=lambda slot: slot[4], reverse=True)
+        live_size = sum(slot[2] for slot in live)
+        if (
+            len(live) >= self._max_entries
+            or live_size + needed > self.data_size
+        ):
+            if self._cull_frequency == 0:
+                live = []
+            else:
+                cull = max(1, len(live) // self._cull_frequency)
+                live = live[:len(live) - cull]
+            live_size = sum(slot[2] for slot in live)
+        while live and live_size + needed > self.data_size:
+            live_size -= live.pop()[2]
+        entries = [
+            (slot, self._read_payload(slot[1], slot[2])) for slot in live
+        ]
+        tick = self._read_header()[0]
+        self._reset()
+        used = 0
+        for (key_hash, _, length, expires, last_used, _), payload in entries:
+            start = self.data_start + used
+            self._map[start:start + length] = payload
+            index = key_hash % self.slots
+            while self._read_slot(index)[5] != EMPTY:
+                index = (index + 1) % self.slots
+            self._write_slot(
+                index, key_hash, used, length, expires, last_used, USED
+            )
+            used += length
+        self._write_header(tick, used, len(entries))
+
+    def _encode_key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key.encode()
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._encode_key(key, version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        with self._locked():
+            if self._get_live(key) is not None:
+                return False
+            return self._store(key, pickled, self._expires(timeout))
+
+    def get(self, key, default=None, version=None):
+        key = self._encode_key(key, version)
+        with self._locked():
+            index = self._get_live(key)
+            if index is None:
+                return default
+            self._touch_slot(index)
+            _, offset, length, _, _, _ = self._read_slot(index)
+            pickled = self._split(self._read_payload(offset, length))[1]
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._encode_key(key, version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        with self._locked():
+            self._store(key, pickled, self._expires(timeout))
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._encode_key(key, version)
+        with self._locked():
+            index = self._get_live(key)
+            if index is None:
+                return False
+            slot = list(self._read_slot(index))
+            slot[3] = self._expires(timeout)
+            self._write_slot(index, *slot)
+            return True
+
+    def incr(self, key, delta=1, version=None):
+        key = self._encode_key(key, version)
+        with self._locked():
+            index = self._get_live(key)
+            if index is None:
+                raise ValueError("Key '%s' not found" % key.decode())
+            _, offset, length, expires, _, _ = self._read_slot(index)
+            value = pickle.loads(
+                self._split(self._read_payload(offset, length))[1]
+            )
+            new_value = value + delta
+            self._store(
+                key, pickle.dumps(new_value, self.pickle_protocol), expires
+            )
+        return new_value
+
+    def has_key(self, key, version=None):
+        key = self._encode_key(key, version)
+        with self._locked():
+            return self._get_live(key) is not None
+
+    def delete(self, key, version=None):
+        key = self._encode_key(key, version)
+        with self._locked():
+            index, _ = self._find(key)
+            if index is not None:
+                self._delete_slot(index)
+
+    def clear(self):
+        with self._locked():
+            self._reset()
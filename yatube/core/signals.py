@@ -0,0 +1,14 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import slow_queries, sqlite
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    sqlite.configure_connection(connection)
+
+
+@receiver(connection_created)
+def install_slow_query_log(sender, connection, **kwargs):
+    slow_queries.install(connection)
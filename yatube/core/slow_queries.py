@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db.backends.sqlite3.base import SQLiteCursorWrapper
+
+from .instrumentation import current_request, fingerprint
+
+logger = logging.getLogger('core.slow_queries')
+
+SAFE_PARAM_TYPES = (bool, int, float, type(None))
+
+
+def redact(params):
+    """Оставляет числа, вместо строк и байтов пишет тип и длину."""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {name: redact_value(value) for name, value in params.items()}
+    return [redact_value(value) for value in params]
+
+
+def redact_value(value):
+    if isinstance(value, SAFE_PARAM_TYPES):
+        return value
+    try:
+        return f'<{type(value).__name__}:{len(value)}>'
+    except TypeError:
+        return f'<{type(value).__name__}>'
+
+
+def explain(connection, sql, params):
+    if connection.vendor != 'sqlite':
+        return None
+    cursor = connection.connection.cursor(factory=SQLiteCursorWrapper)
+    try:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception:
+        return None
+    finally:
+        cursor.close()
+
+
+def get_view_name():
+    request = current_request.get()
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else None
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """execute_wrapper, пишущий в лог запросы дольше порога."""
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = (time.perf_counter() - started) * 1000
+        if duration >= threshold:
+            logger.warning(json.dumps({
+                'fingerprint': fingerprint(sql),
+                'sql': sql,
+                'params': None if many else redact(params),
+                'many': many,
+                'duration_ms': round(duration, 3),
+                'view': get_view_name(),
+                'plan': None if many else explain(
+                    context['connection'], sql, params
+                ),
+            }, ensure_ascii=False, default=str))
+
+
+def install(connection):
+    # Соединение обычно открывается внутри запроса, когда стек уже
+    # содержит обёртки execute_wrapper() других слоёв: при выходе они
+    # снимают верхние элементы, поэтому журнал кладётся в самый низ.
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, log_slow_queries)
+
+
+def get_log_paths(path):
+    """Файл лога и его ротированные копии, от старых к новым."""
+    paths = []
+    index = 1
+    while os.path.exists(f'{path}.{index}'):
+        paths.append(f'{path}.{index}')
+        index += 1
+    paths.reverse()
+    if os.path.exists(path):
+        paths.append(path)
+    return paths
+
+
+def read_log(paths):
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class QueryGroup:
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.views = Counter()
+        self.plan = None
+
+    @property
+    def average(self):
+        return self.total / self.count
+
+    def add(self, record):
+        self.count += 1
+        self.total += record['duration_ms']
+        self.max = max(self.max, record['duration_ms'])
+        self.views[record.get('view')] += 1
+        self.plan = record.get('plan') or self.plan
+
+
+def aggregate(records):
+    groups = {}
+    for record in records:
+        key = record.get('fingerprint')
+        if key is None:
+            continue
+        if key not in groups:
+            groups[key] = QueryGroup(key)
+        groups[key].add(record)
+    return list(groups.values())
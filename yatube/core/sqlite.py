@@ -0,0 +1,12 @@
+from django.conf import settings
+
+
+def apply_pragmas(connection, pragmas):
+    """Выполняет PRAGMA на DB-API соединении sqlite3."""
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_connection(connection):
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection.connection, settings.SQLITE_PRAGMAS)
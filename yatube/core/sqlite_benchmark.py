@@ -0,0 +1,171 @@
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from posts.models import Post
+
+from .sqlite import apply_pragmas
+
+# Режим, в котором база работала до настройки: журнал отката,
+# полная синхронизация и новое соединение на каждый запрос.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+}
+DEFAULT_TIMEOUT = 5
+PROFILES = {
+    'default': (DEFAULT_PRAGMAS, False),
+    'tuned': (settings.SQLITE_PRAGMAS, True),
+}
+INSERT_SQL = (
+    'INSERT INTO posts_post (text, pub_date, updated, author_id, group_id) '
+    'VALUES (?, ?, ?, ?, NULL)'
+)
+
+
+def get_read_queries():
+    feed = Post.objects.feed()
+    return [
+        feed[:10].query.sql_with_params(),
+        feed.filter(pk=0).query.sql_with_params(),
+    ]
+
+
+class Worker(threading.Thread):
+    def __init__(self, path, pragmas, persistent, deadline, seed):
+        super().__init__()
+        self.path = path
+        self.pragmas = pragmas
+        self.persistent = persistent
+        self.deadline = deadline
+        self.rng = random.Random(seed)
+        self.operations = 0
+        self.errors = 0
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(
+                self.path, timeout=DEFAULT_TIMEOUT,
+                check_same_thread=False,
+            )
+            apply_pragmas(self.connection, self.pragmas)
+        return self.connection
+
+    def release(self):
+        if not self.persistent and self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def run(self):
+        while time.monotonic() < self.deadline:
+            try:
+                self.step(self.connect())
+            except sqlite3.OperationalError:
+                self.errors += 1
+            else:
+                self.operations += 1
+            finally:
+                self.release()
+        if self.connection is not None:
+            self.connection.close()
+
+
+class Reader(Worker):
+    def __init__(self, queries, max_pk, *args):
+        super().__init__(*args)
+        self.queries = queries
+        self.max_pk = max_pk
+
+    def step(self, connection):
+        sql, params = self.rng.choice(self.queries)
+        if params:
+            params = (self.rng.randint(1, self.max_pk),)
+        connection.execute(sql.replace('%s', '?'), params).fetchall()
+
+
+class Writer(Worker):
+    def __init__(self, author_id, *args):
+        super().__init__(*args)
+        self.author_id = author_id
+
+    def step(self, connection):
+        now = timezone.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        with connection:
+            connection.execute(
+                INSERT_SQL, ('Пост для замера', now, now, self.author_id)
+            )
+
+
+def copy_database(target):
+    destination = sqlite3.connect(target)
+    try:
+        connection.ensure_connection()
+        connection.connection.backup(destination)
+    finally:
+        destination.close()
+
+
+def run_profile(source, pragmas, persistent, readers, writers, duration):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'db.sqlite3')
+        shutil.copyfile(source, path)
+        setup = sqlite3.connect(path)
+        try:
+            # Режим журнала хранится в самом файле базы.
+            apply_pragmas(setup, {'journal_mode': pragmas['journal_mode']})
+            max_pk = setup.execute(
+                'SELECT MAX(id) FROM posts_post'
+            ).fetchone()[0] or 1
+            author_id = setup.execute(
+                'SELECT MIN(id) FROM auth_user'
+            ).fetchone()[0]
+        finally:
+            setup.close()
+        deadline = time.monotonic() + duration
+        workers = [
+            Reader(get_read_queries(), max_pk, path, pragmas, persistent,
+                   deadline, seed)
+            for seed in range(readers)
+        ] + [
+            Writer(author_id, path, pragmas, persistent, deadline, seed)
+            for seed in range(writers)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    return {
+        'reads_per_s': summarize(workers[:readers], duration),
+        'writes_per_s': summarize(workers[readers:], duration),
+        'errors': sum(worker.errors for worker in workers),
+    }
+
+
+def summarize(workers, duration):
+    return round(sum(worker.operations for worker in workers) / duration, 1)
+
+
+def run_benchmark(readers=4, writers=2, duration=5):
+    """Сравнивает пропускную способность базы до и после настройки.
+
+    Каждый профиль работает со своей копией текущей базы: читатели
+    выполняют запросы ленты и страницы поста, писатели добавляют посты.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'source.sqlite3')
+        copy_database(source)
+        return {
+            name: run_profile(
+                source, pragmas, persistent, readers, writers, duration
+            )
+            for name, (pragmas, persistent) in PROFILES.items()
+        }
@@ -0,0 +1,19 @@
+from django import template
+
+register = template.Library()
+
+PAGINATION_PARAMS = ('page', 'after', 'before')
+
+
+@register.simple_tag(takes_context=True)
+def page_url(context, **params):
+    query = context['request'].GET.copy()
+    for name in PAGINATION_PARAMS:
+        query.pop(name, None)
+    query.update(params)
+    return f'?{query.urlencode()}'
+
+
+@register.filter
+def elided_page_range(page_obj):
+    return page_obj.paginator.get_elided_page_range(page_obj.number)
@@ -0,0 +1,38 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.budget import QueryBudgetExceeded, query_budget
+from core.instrumentation import fingerprint
+from posts.models import User
+
+USERNAMES = ('first', 'second', 'third')
+
+
+@query_budget(1)
+def users_view(request):
+    for username in USERNAMES:
+        User.objects.filter(username=username).exists()
+    return HttpResponse()
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_strict_mode_raises(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, '3 × SELECT'):
+            users_view(self.request)
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_production_mode_logs(self):
+        with self.assertLogs('core.budget', 'WARNING') as logs:
+            response = users_view(self.request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('3 SQL-запросов при бюджете 1', logs.output[0])
+
+    def test_fingerprint_hides_values(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE a = 'x'  AND id IN (1, 2, 3)"),
+            'SELECT * FROM t WHERE a = ? AND id IN (...)',
+        )
@@ -0,0 +1,126 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.metrics import AGGREGATE_FILE, Registry, registry
+from posts.models import Post, User
+
+AUTHOR = 'auth'
+POST_TEXT = 'Тестовый пост'
+METRICS_URL = reverse('metrics')
+
+
+class MetricsEndpointTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        Post.objects.create(author=cls.author, text=POST_TEXT)
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.guest_client = Client()
+
+    def test_views_are_measured(self):
+        self.guest_client.get(reverse('posts:index'))
+        self.guest_client.get(reverse('posts:index'))
+        self.guest_client.get(reverse('about:author'))
+        content = self.guest_client.get(METRICS_URL).content.decode()
+        self.assertIn(
+            'yatube_http_requests_total'
+            '{method="GET",status="200",view="posts:index"} 2',
+            content,
+        )
+        self.assertIn(
+            'yatube_db_queries_per_request_bucket'
+            '{le="1",view="posts:index"} 2',
+            content,
+        )
+        self.assertIn(
+            'yatube_http_request_duration_seconds_count'
+            '{view="about:author"} 1',
+            content,
+        )
+        self.assertIn(
+            'yatube_feed_cache_requests_total'
+            '{result="hit",view="posts:index"} 1',
+            content,
+        )
+        self.assertNotIn('view="metrics"', content)
+
+    @override_settings(METRICS_ALLOWED_IPS=())
+    def test_endpoint_is_hidden_from_other_hosts(self):
+        response = self.guest_client.get(METRICS_URL)
+        self.assertEqual(response.status_code, 404)
+
+
+class RegistryTests(TestCase):
+    def test_snapshots_of_processes_are_summed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, '1.json'), 'w') as file:
+                json.dump([
+                    ['hits', 'hits', [['view', 'index']], 3],
+                ], file)
+            local = Registry()
+            hits = local.counter('hits', 'Попадания.')
+            hits.inc(2, view='index')
+            with override_settings(METRICS_DIR=directory):
+                local.flush()
+                self.assertTrue(os.path.exists(local.get_path(directory)))
+                hits.inc(view='index')
+                content = local.render()
+        self.assertIn('# TYPE hits counter', content)
+        self.assertIn('hits{view="index"} 6', content)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.local = Registry()
+        self.hits = self.local.counter('hits', 'Попадания.')
+
+    def write_snapshot(self, filename, value):
+        with open(os.path.join(self.directory, filename), 'w') as file:
+            json.dump([['hits', 'hits', [['view', 'index']], value]], file)
+
+    def get_dead_pid(self):
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        return process.pid
+
+    def render(self):
+        with override_settings(METRICS_DIR=self.directory):
+            return self.local.render()
+
+    def test_dead_process_snapshot_is_merged_once(self):
+        filename = f'{self.get_dead_pid()}-1.json'
+        self.write_snapshot(filename, 3)
+        self.assertIn('hits{view="index"} 3', self.render())
+        self.assertFalse(
+            os.path.exists(os.path.join(self.directory, filename))
+        )
+        self.assertIn('hits{view="index"} 3', self.render())
+
+    def test_reused_pid_does_not_overwrite_snapshot(self):
+        self.write_snapshot(f'{os.getpid()}-1.json', 3)
+        self.hits.inc(2, view='index')
+        with override_settings(METRICS_DIR=self.directory):
+            self.local.flush()
+        self.assertIn('hits{view="index"} 5', self.render())
+
+    def test_merged_snapshot_left_after_crash_is_not_counted_twice(self):
+        filename = f'{self.get_dead_pid()}-1.json'
+        self.write_snapshot(filename, 3)
+        with open(os.path.join(self.directory, AGGREGATE_FILE), 'w') as file:
+            json.dump({
+                'samples': [['hits', 'hits', [['view', 'index']], 3]],
+                'merged': [filename],
+            }, file)
+        self.assertIn('hits{view="index"} 3', self.render())
@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from core.mmap_cache import MmapCache
+
+PROCESSES = 4
+THREADS = 20
+INCREMENTS = 200
+PARAMS = {'OPTIONS': {'MAX_SIZE': 4096}}
+
+
+def increment(path):
+    cache = MmapCache(path, PARAMS)
+    for _ in range(INCREMENTS):
+        cache.incr('counter')
+
+
+class MmapCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache')
+        self.cache = self.make_cache()
+
+    def make_cache(self, **options):
+        return MmapCache(self.path, {
+            'OPTIONS': {**PARAMS['OPTIONS'], **options},
+        })
+
+    def test_set_get_delete(self):
+        self.cache.set('key', {'value': 1})
+        self.assertEqual(self.cache.get('key'), {'value': 1})
+        self.assertFalse(self.cache.add('key', 'other'))
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+        self.assertTrue(self.cache.add('key', 'other'))
+
+    def test_values_are_shared_between_instances(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(self.make_cache().get('key'), 'value')
+        self.make_cache().clear()
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_ttl(self):
+        self.cache.set('key', 'value', 0.05)
+        self.cache.set('forever', 'value', None)
+        time.sleep(0.1)
+        self.assertFalse(self.cache.has_key('key'))
+        self.assertTrue(self.cache.has_key('forever'))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        value = 'x' * 500
+        for index in range(6):
+            self.cache.set(f'key{index}', value)
+        self.cache.get('key0')
+        for index in range(6, 10):
+            self.cache.set(f'key{index}', value)
+        self.assertEqual(self.cache.get('key0'), value)
+        self.assertIsNone(self.cache.get('key1'))
+        self.assertEqual(self.cache.get('key9'), value)
+
+    def test_max_entries(self):
+        cache = self.make_cache(MAX_ENTRIES=3)
+        for index in range(10):
+            cache.set(f'key{index}', index)
+        self.assertEqual(cache.get('key9'), 9)
+        self.assertLessEqual(
+            sum(cache.has_key(f'key{index}') for index in range(10)), 3
+        )
+
+    def test_threads_share_one_descriptor(self):
+        self.cache.set('key', 'value')
+        descriptors = len(os.listdir('/proc/self/fd'))
+        threads = [
+            threading.Thread(target=lambda: self.make_cache().get('key'))
+            for _ in range(THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(os.listdir('/proc/self/fd')), descriptors)
+
+    def test_incr_is_atomic_across_processes(self):
+        self.cache.set('counter', 0)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(target=increment, args=(self.path,))
+            for _ in range(PROCESSES)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(self.cache.get('counter'), PROCESSES * INCREMENTS)
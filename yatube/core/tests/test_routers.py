@@ -0,0 +1,81 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.routers import (PIN_SESSION_KEY, ReplicaRouter, RoutingState,
+                          routing_state)
+from posts.cache import get_or_build
+from posts.models import Post, User
+
+REPLICA = 'replica'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def route(self, state):
+        token = routing_state.set(state)
+        try:
+            return self.router.db_for_read(Post)
+        finally:
+            routing_state.reset(token)
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.router.db_for_read(Post), REPLICA)
+        self.assertEqual(self.route(RoutingState()), REPLICA)
+
+    def test_pinned_request_reads_primary(self):
+        self.assertEqual(self.route(RoutingState(pinned=True)), 'default')
+
+    def test_reads_after_write_go_to_primary(self):
+        state = RoutingState()
+        token = routing_state.set(state)
+        try:
+            self.assertEqual(self.router.db_for_write(Post), 'default')
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+        finally:
+            routing_state.reset(token)
+        self.assertTrue(state.wrote)
+
+    def test_cached_values_are_built_from_primary(self):
+        cache.clear()
+        value = get_or_build(
+            'test:routing', lambda: self.router.db_for_read(Post), 60
+        )
+        self.assertEqual(value, 'default')
+        self.assertEqual(self.router.db_for_read(Post), REPLICA)
+
+    def test_sessions_are_read_from_primary(self):
+        self.assertEqual(self.router.db_for_read(Session), 'default')
+
+    def test_migrations_run_on_primary_only(self):
+        self.assertTrue(self.router.allow_migrate('default', 'posts'))
+        self.assertFalse(self.router.allow_migrate(REPLICA, 'posts'))
+
+
+@override_settings(DATABASE_REPLICAS=['default'])
+class ReplicaPinningMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def test_author_is_pinned_after_write(self):
+        self.client.post(reverse('posts:post_create'), {'text': 'Пост'})
+        self.assertGreater(
+            self.client.session[PIN_SESSION_KEY], time.time()
+        )
+
+    def test_reads_do_not_pin(self):
+        self.client.get(reverse('posts:index'))
+        self.assertNotIn(PIN_SESSION_KEY, self.client.session)
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from core.slow_queries import log_slow_queries
+from posts.models import Post, User
+
+AUTHOR = 'auth'
+LOGGER = 'core.slow_queries'
+POST_TEXT = 'Тестовый пост'
+SECRET = 'secret'
+
+
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        Post.objects.create(author=cls.author, text=POST_TEXT)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def log_all_queries(self):
+        return self.settings(SLOW_QUERY_THRESHOLD_MS=0)
+
+    def get_records(self, logs):
+        return [json.loads(record.getMessage()) for record in logs.records]
+
+    def test_view_and_plan_are_logged(self):
+        with self.log_all_queries(), self.assertLogs(LOGGER) as logs:
+            self.guest_client.get(reverse('posts:index'))
+        record = self.get_records(logs)[0]
+        self.assertEqual(record['view'], 'posts:index')
+        self.assertIn('FROM "posts_post"', record['fingerprint'])
+        self.assertTrue(any('posts_post' in step for step in record['plan']))
+
+    def test_params_are_redacted(self):
+        with self.log_all_queries(), self.assertLogs(LOGGER) as logs:
+            User.objects.filter(username=SECRET).exists()
+        record = self.get_records(logs)[0]
+        self.assertIsNone(record['view'])
+        self.assertEqual(record['params'], [f'<str:{len(SECRET)}>'])
+        self.assertNotIn(SECRET, json.dumps(record))
+
+
+class ReconnectTests(TransactionTestCase):
+    def test_wrapper_survives_connection_opened_in_request(self):
+        # Тестовая база живёт в памяти, пока открыто старое соединение,
+        # поэтому его откладывают, а запрос открывает новое.
+        cache.clear()
+        saved = connection.connection
+        connection.connection = None
+        connection.execute_wrappers.clear()
+        try:
+            Client().get(reverse('posts:index'))
+            self.assertEqual(connection.execute_wrappers, [log_slow_queries])
+        finally:
+            if connection.connection is not None:
+                connection.connection.close()
+            connection.connection = saved
+
+
+class SlowQueriesCommandTests(TestCase):
+    def test_report_groups_by_fingerprint(self):
+        records = [
+            {'fingerprint': 'SELECT ? FROM a', 'duration_ms': 120,
+             'view': 'posts:index', 'plan': ['SCAN a']},
+            {'fingerprint': 'SELECT ? FROM a', 'duration_ms': 300,
+             'view': 'posts:index', 'plan': ['SCAN a']},
+            {'fingerprint': 'SELECT ? FROM b', 'duration_ms': 200,
+             'view': None, 'plan': None},
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'slow.log')
+            with open(f'{path}.1', 'w', encoding='utf-8') as file:
+                file.write(json.dumps(records[0]) + '\n')
+            with open(path, 'w', encoding='utf-8') as file:
+                for record in records[1:]:
+                    file.write(json.dumps(record) + '\n')
+            out = StringIO()
+            call_command('slow_queries', log=path, stdout=out)
+        report = out.getvalue()
+        self.assertIn('2 × всего 420.0 мс, макс. 300.0 мс', report)
+        self.assertIn('View: posts:index (2)', report)
+        self.assertIn('План: SCAN a', report)
+        self.assertLess(report.index('FROM a'), report.index('FROM b'))
@@ -0,0 +1,34 @@
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from core.sqlite_benchmark import run_benchmark
+from posts.models import Post, User
+
+
+class SqlitePragmasTests(TestCase):
+    def get_pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied_on_connect(self):
+        pragmas = {
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'cache_size': -64 * 1024,
+            'temp_store': 2,
+        }
+        for name, value in pragmas.items():
+            with self.subTest(pragma=name):
+                self.assertEqual(self.get_pragma(name), value)
+
+
+class SqliteBenchmarkTests(TransactionTestCase):
+    def test_profiles_are_compared(self):
+        author = User.objects.create_user(username='auth')
+        Post.objects.create(author=author, text='Тестовый пост')
+        results = run_benchmark(readers=2, writers=1, duration=0.2)
+        self.assertEqual(set(results), {'default', 'tuned'})
+        for result in results.values():
+            self.assertGreater(result['reads_per_s'], 0)
+            self.assertGreater(result['writes_per_s'], 0)
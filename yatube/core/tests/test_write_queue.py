@@ -0,0 +1,80 @@
+import threading
+from functools import partial
+
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import Client, TransactionTestCase
+from django.urls import reverse
+
+from core.routers import RoutingState, routing_state
+from core.write_queue import Job, WriteQueue
+from posts.models import Post, User
+
+POST_TEXT = 'Пост через очередь'
+THREADS = 8
+
+
+class WriteQueueTests(TransactionTestCase):
+    def setUp(self):
+        self.queue = WriteQueue()
+
+    def test_submit_returns_result(self):
+        user = self.queue.submit(User.objects.create_user, username='auth')
+        self.assertEqual(User.objects.get(username='auth'), user)
+
+    def test_failed_job_does_not_roll_back_batch(self):
+        jobs = [
+            Job(partial(User.objects.create_user, username=name))
+            for name in ('first', 'first', 'second')
+        ]
+        for job in jobs:
+            job.future.set_running_or_notify_cancel()
+        self.queue.commit(jobs)
+        self.assertIsInstance(jobs[1].future.exception(), IntegrityError)
+        self.assertEqual(
+            set(User.objects.values_list('username', flat=True)),
+            {'first', 'second'},
+        )
+
+    def test_concurrent_submits(self):
+        def submit(index):
+            self.queue.submit(User.objects.create_user, username=f'u{index}')
+
+        threads = [
+            threading.Thread(target=submit, args=(index,))
+            for index in range(THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(User.objects.count(), THREADS)
+
+    def test_write_is_recorded_in_request_routing_state(self):
+        state = RoutingState()
+        token = routing_state.set(state)
+        try:
+            self.queue.submit(User.objects.create_user, username='auth')
+        finally:
+            routing_state.reset(token)
+        self.assertTrue(state.wrote)
+
+
+class QueuedPostCreateTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='auth')
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def test_post_create_through_queue(self):
+        with self.settings(WRITE_QUEUE_ENABLED=True):
+            response = self.client.post(
+                reverse('posts:post_create'), {'text': POST_TEXT}
+            )
+        self.assertRedirects(
+            response, reverse('posts:profile', args=(self.author,))
+        )
+        self.assertTrue(
+            Post.objects.filter(author=self.author, text=POST_TEXT).exists()
+        )
@@ -0,0 +1,99 @@
+import contextvars
+import os
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError
+from functools import partial
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, transaction
+
+
+class Job:
+    def __init__(self, func):
+        # Запись выполняется в контексте запроса: так ReplicaRouter
+        # отмечает запись в его RoutingState.
+        self.context = contextvars.copy_context()
+        self.func = func
+        self.future = Future()
+
+
+class WriteQueue:
+    """Записи, которые один поток процесса выполняет пачками.
+
+    SQLite пропускает только одного писателя, поэтому параллельные
+    запросы не спорят за блокировку, а складывают записи в очередь.
+    Поток берёт до WRITE_QUEUE_BATCH_SIZE записей и выполняет их в одной
+    транзакции, каждую в своей точке сохранения: ошибка одной записи
+    возвращается её запросу и не откатывает остальные.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.lock = threading.Lock()
+        self.pid = None
+
+    def _start(self):
+        # После fork поток писателя остаётся только у родителя.
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.jobs = queue.Queue()
+            threading.Thread(
+                target=self._run, name='write-queue', daemon=True
+            ).start()
+            self.pid = os.getpid()
+
+    def submit(self, func, *args, **kwargs):
+        """Ставит запись в очередь и возвращает её результат."""
+        self._start()
+        job = Job(partial(func, *args, **kwargs))
+        self.jobs.put(job)
+        try:
+            return job.future.result(settings.WRITE_QUEUE_TIMEOUT)
+        except TimeoutError:
+            if job.future.cancel():
+                raise
+            # Запись уже выполняется: её результат придёт вместе с пачкой.
+            return job.future.result()
+
+    def _run(self):
+        while True:
+            batch = [self.jobs.get()]
+            while len(batch) < settings.WRITE_QUEUE_BATCH_SIZE:
+                try:
+                    batch.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            self.commit([
+                job for job in batch
+                if job.future.set_running_or_notify_cancel()
+            ])
+
+    def commit(self, batch):
+        if not batch:
+            return
+        results = []
+        try:
+            close_old_connections()
+            with transaction.atomic(using=self.using):
+                for job in batch:
+                    try:
+                        with transaction.atomic(using=self.using):
+                            result = job.context.run(job.func)
+                    except Exception as error:
+                        results.append((job, None, error))
+                    else:
+                        results.append((job, result, None))
+        except Exception as error:
+            for job in batch:
+                job.future.set_exception(error)
+            return
+        for job, result, error in results:
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+
+
+write_queue = WriteQueue()
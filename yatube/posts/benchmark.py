@@ -0,0 +1,149 @@
+import json
+import random
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from .models import Group, Post
+
+PERCENTILES = (50, 95, 99)
+DEFAULT_TOLERANCE = 0.2
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark',
+    }
+}
+
+
+def isolated_cache():
+    """Отдельный кеш процесса на время замеров.
+
+    Настроенный кеш может быть общим с работающими воркерами: замер
+    сбросил бы его и положил туда страницы сгенерированной базы.
+    """
+    return override_settings(CACHES=BENCHMARK_CACHES)
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = max(0, round(percent / 100 * len(values)) - 1)
+    return values[index]
+
+
+def pick(rng, queryset):
+    bounds = queryset.aggregate(low=Min('pk'), high=Max('pk'))
+    return queryset.filter(
+        pk__gte=rng.randint(bounds['low'], bounds['high'])
+    ).order_by('pk').first()
+
+
+class Route:
+    def __init__(self, name, url, data=None):
+        self.name = name
+        self.url = url
+        self.data = data
+
+    def request(self, client):
+        if self.data is None:
+            return client.get(self.url)
+        return client.post(self.url, self.data)
+
+
+def get_routes(rng):
+    post = pick(rng, Post.objects.all())
+    author = post.author
+    group = pick(rng, Group.objects.all())
+    oldest = Post.objects.order_by('pub_date', 'pk').first()
+    return (
+        Route('index', reverse('posts:index')),
+        Route('index_last', reverse('posts:index') + '?page=last'),
+        Route('group_list', reverse('posts:group_list', args=(group.slug,))),
+        Route('profile', reverse('posts:profile', args=(author,))),
+        Route('post_detail', reverse('posts:post_detail', args=(post.pk,))),
+        Route(
+            'post_detail_oldest',
+            reverse('posts:post_detail', args=(oldest.pk,)),
+        ),
+        Route('post_create_form', reverse('posts:post_create')),
+        Route(
+            'post_create',
+            reverse('posts:post_create'),
+            {'text': 'Пост для замера'},
+        ),
+        Route(
+            'post_edit',
+            reverse('posts:post_edit', args=(post.pk,)),
+            {'text': 'Правка для замера'},
+        ),
+    ), author
+
+
+def measure(route, client, requests, warm_cache):
+    timings, queries, sizes = [], [], []
+    for _ in range(requests):
+        if not warm_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = route.request(client)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(context.captured_queries))
+        sizes.append(len(response.content))
+    result = {
+        f'p{percent}_ms': round(percentile(timings, percent), 3)
+        for percent in PERCENTILES
+    }
+    result['queries'] = max(queries)
+    result['bytes'] = max(sizes)
+    return result
+
+
+def run_benchmark(requests, seed=0, warm_cache=False):
+    """Прогоняет каждый маршрут posts через тестовый клиент."""
+    rng = random.Random(seed)
+    routes, author = get_routes(rng)
+    client = Client()
+    client.force_login(author)
+    return {
+        route.name: measure(route, client, requests, warm_cache)
+        for route in routes
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Возвращает строки отчёта и список ухудшений относительно базы."""
+    lines, regressions = [], []
+    for name, result in results.items():
+        base = baseline.get(name, {})
+        cells = []
+        for metric, value in result.items():
+            old = base.get(metric)
+            if old:
+                change = (value - old) / old
+                cells.append(f'{metric}={value} ({change:+.0%})')
+                limit = 0 if metric == 'queries' else tolerance
+                if change > limit:
+                    regressions.append(f'{name}.{metric}')
+            else:
+                cells.append(f'{metric}={value}')
+        lines.append(f'{name}: ' + ', '.join(cells))
+    return lines, regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, results):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
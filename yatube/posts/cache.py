@@ -0,0 +1,182 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from core.cache import get_versions
+from core.metrics import FEED_CACHE
+from core.routers import read_from_primary
+
+INDEX_SCOPE = 'index'
+GROUPS_SCOPE = 'groups'
+USERS_SCOPE = 'users'
+GROUP_SCOPE = 'group:{slug}'
+PROFILE_SCOPE = 'profile:{username}'
+POPULAR_SCOPE = 'popular'
+INDEX_FEED = (INDEX_SCOPE, GROUPS_SCOPE, USERS_SCOPE)
+GROUP_FEED = (GROUP_SCOPE, USERS_SCOPE)
+PROFILE_FEED = (PROFILE_SCOPE, GROUPS_SCOPE, USERS_SCOPE)
+# Список популярных меняют и новые посты, и сброс просмотров.
+POPULAR_FEED = (POPULAR_SCOPE, INDEX_SCOPE, GROUPS_SCOPE, USERS_SCOPE)
+PAGE_KEY = 'feed:page:{versions}:{user}:{path}'
+STALE_PAGE_KEY = 'feed:stale:{user}:{path}'
+LOCK_KEY = '{key}:lock'
+LOCK_POLL_INTERVAL = 0.05
+ROWS_KEY = 'feed:rows:{scopes}:{versions}'
+CHOICES_KEY = 'choices:{name}:{versions}'
+
+
+def _hash(value):
+    return hashlib.md5(value.encode()).hexdigest()
+
+
+def feed_scopes(feed, **kwargs):
+    return tuple(scope.format(**kwargs) for scope in feed)
+
+
+def set_fresh(key, value, timeout):
+    """Кладёт значение для get_or_build: свежим на ``timeout`` секунд."""
+    cache.set(
+        key, (value, time.time() + timeout),
+        timeout + settings.FEED_STALE_TIMEOUT,
+    )
+
+
+def wait_for(key, lock_key):
+    """Ждёт значение от держателя блокировки.
+
+    Возвращает запись и признак того, что блокировку взял сам ожидающий:
+    если держатель отпустил её, не сохранив значения, ждать больше нечего.
+    """
+    deadline = time.monotonic() + settings.FEED_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry, False
+        if (
+            not cache.has_key(lock_key)
+            and cache.add(lock_key, 1, settings.FEED_LOCK_TIMEOUT)
+        ):
+            return None, True
+    return None, False
+
+
+def get_or_build(key, build, timeout, stale_key=None):
+    """Значение из кеша; на промахе его строит только один запрос.
+
+    Запись хранится ещё FEED_STALE_TIMEOUT после ``timeout``. Пока один
+    запрос строит новое значение, остальные получают устаревшее: по тому
+    же ключу или, если его нет, по ``stale_key``. Без него они ждут
+    результата до FEED_LOCK_WAIT секунд, а если блокировка освободилась
+    без значения, строят его сами. Если ``build`` вернул None, значение
+    не кешируется.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry[1] > time.time():
+        return entry[0]
+    lock_key = LOCK_KEY.format(key=key)
+    locked = cache.add(lock_key, 1, settings.FEED_LOCK_TIMEOUT)
+    if not locked:
+        if entry is None and stale_key is not None:
+            entry = cache.get(stale_key)
+        if entry is None:
+            entry, locked = wait_for(key, lock_key)
+        if entry is not None:
+            return entry[0]
+    try:
+        with read_from_primary():
+            value = build()
+        if value is not None:
+            set_fresh(key, value, timeout)
+            if stale_key is not None:
+                set_fresh(stale_key, value, timeout)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
+
+
+def get_page_key(request, scopes):
+    return PAGE_KEY.format(
+        versions='.'.join(map(str, get_versions(scopes))),
+        user=request.user.pk or 0,
+        path=_hash(request.get_full_path()),
+    )
+
+
+def get_cached_choices(name, scopes, build):
+    """Список вариантов выбора, живущий до изменения областей."""
+    key = CHOICES_KEY.format(
+        name=name, versions='.'.join(map(str, get_versions(scopes)))
+    )
+    return get_or_build(key, build, settings.FEED_CACHE_TIMEOUT)
+
+
+def get_rows_key(scopes, versions):
+    return ROWS_KEY.format(
+        scopes=_hash(':'.join(scopes)),
+        versions='.'.join(map(str, versions)),
+    )
+
+
+def make_etag(*parts):
+    return '"{}"'.format(_hash(':'.join(map(str, parts))))
+
+
+def cache_feed(*scopes):
+    """Кеширует страницу ленты до изменения любой из её областей.
+
+    Области задаются строками с подстановкой аргументов view,
+    например ``'group:{slug}'``. ETag строится из того же ключа, поэтому
+    на If-None-Match ответ 304 отдаётся без запросов к базе. Пока страницу
+    перестраивает один запрос, остальные получают её прошлую версию
+    с её же ETag.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            key = get_page_key(
+                request, [scope.format(**kwargs) for scope in scopes]
+            )
+            view_name = getattr(request.resolver_match, 'view_name', None)
+            response = get_conditional_response(
+                request, etag=make_etag(key)
+            )
+            if response is not None:
+                FEED_CACHE.inc(view=view_name, result='hit')
+                return response
+            rendered = None
+
+            def build():
+                nonlocal rendered
+                rendered = view(request, *args, **kwargs)
+                if rendered.status_code == 200:
+                    return key, rendered.content
+                return None
+
+            stale_key = STALE_PAGE_KEY.format(
+                user=request.user.pk or 0,
+                path=_hash(request.get_full_path()),
+            )
+            page = get_or_build(
+                key, build, settings.FEED_CACHE_TIMEOUT, stale_key
+            )
+            if rendered is None:
+                FEED_CACHE.inc(view=view_name, result='hit')
+                response = HttpResponse(page[1])
+            else:
+                FEED_CACHE.inc(view=view_name, result='miss')
+                response = rendered
+            if page is not None:
+                response['ETag'] = make_etag(page[0])
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,180 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import (Case, Count, F, OuterRef, PositiveIntegerField,
+                              Subquery, Value, When)
+from django.db.models.functions import Coalesce, Greatest
+
+from core.cache import invalidate
+from core.routers import routing_state
+
+from .cache import POPULAR_SCOPE
+from .models import AuthorStats, Group, Post, User
+
+# Каждый пост занимает три параметра запроса из лимита SQLite в 999.
+VIEWS_BATCH_SIZE = 300
+
+logger = logging.getLogger('posts.counters')
+
+
+def _shifted_count(delta):
+    # Разошедшийся с постами счётчик не должен уходить ниже нуля:
+    # CHECK на PositiveIntegerField уронил бы удаление поста.
+    return Greatest(F('posts_count') + delta, Value(0))
+
+
+def change_posts_count(author_id=None, group_id=None, delta=1):
+    with transaction.atomic():
+        if author_id is not None:
+            if delta > 0:
+                AuthorStats.objects.get_or_create(author_id=author_id)
+            AuthorStats.objects.filter(author_id=author_id).update(
+                posts_count=_shifted_count(delta)
+            )
+        if group_id is not None:
+            Group.objects.filter(pk=group_id).update(
+                posts_count=_shifted_count(delta)
+            )
+
+
+def get_posts_count(author):
+    try:
+        return author.stats.posts_count
+    except AuthorStats.DoesNotExist:
+        return 0
+
+
+def _count_posts(post_model, field):
+    return Coalesce(
+        Subquery(
+            post_model.objects.order_by()
+            .filter(**{field: OuterRef('pk')})
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count')
+        ),
+        Value(0),
+    )
+
+
+def rebuild_posts_counts(post_model=Post, group_model=Group,
+                         stats_model=AuthorStats, user_model=User):
+    with transaction.atomic():
+        stats_model.objects.bulk_create(
+            stats_model(author_id=pk) for pk in user_model.objects
+            .filter(stats__isnull=True).values_list('pk', flat=True)
+        )
+        authors = stats_model.objects.update(
+            posts_count=_count_posts(post_model, 'author')
+        )
+        groups = group_model.objects.update(
+            posts_count=_count_posts(post_model, 'group')
+        )
+    return authors, groups
+
+
+def add_views(counts, post_model=Post):
+    """Прибавляет просмотры ``{post_id: число}`` одним UPDATE на пачку."""
+    ids = sorted(counts)
+    with transaction.atomic():
+        for start in range(0, len(ids), VIEWS_BATCH_SIZE):
+            batch = ids[start:start + VIEWS_BATCH_SIZE]
+            post_model.objects.filter(pk__in=batch).update(
+                views=F('views') + Case(
+                    *(When(pk=pk, then=Value(counts[pk])) for pk in batch),
+                    default=Value(0),
+                    output_field=PositiveIntegerField(),
+                )
+            )
+
+
+class ViewCounter:
+    """Просмотры постов, накопленные в памяти процесса.
+
+    Раз в ``VIEWS_FLUSH_INTERVAL`` секунд накопленное прибавляется
+    к ``Post.views`` пачками, поэтому просмотр не стоит отдельной записи
+    в базу. Остаток сбрасывается при остановке процесса; просмотры
+    теряются, только если процесс убит без завершения.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pending = Counter()
+        self.pid = os.getpid()
+        self.flushed = time.monotonic()
+
+    def _check_pid(self):
+        if self.pid != os.getpid():
+            # После fork просмотры родителя сбросит сам родитель.
+            self.reset()
+
+    def add(self, post_id):
+        with self.lock:
+            self._check_pid()
+            self.pending[post_id] += 1
+        self.maybe_flush()
+
+    def get(self, post_id):
+        """Ещё не сброшенные в базу просмотры поста."""
+        with self.lock:
+            self._check_pid()
+            return self.pending[post_id]
+
+    def maybe_flush(self):
+        interval = settings.VIEWS_FLUSH_INTERVAL
+        if interval is None:
+            return
+        if time.monotonic() - self.flushed >= interval:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            self._check_pid()
+            pending, self.pending = self.pending, Counter()
+            self.flushed = time.monotonic()
+        if not pending:
+            return
+        # Сброс не должен привязывать к основной базе сессию читателя.
+        token = routing_state.set(None)
+        try:
+            add_views(pending)
+        except DatabaseError:
+            logger.exception('Не удалось сохранить просмотры постов')
+            with self.lock:
+                self.pending.update(pending)
+            return
+        finally:
+            routing_state.reset(token)
+        invalidate(POPULAR_SCOPE)
+
+    def flush_on_exit(self):
+        # Без интервала (в тестах) просмотры сбрасываются вручную,
+        # а тестовой базы к выходу из процесса уже нет.
+        if settings.VIEWS_FLUSH_INTERVAL is not None:
+            self.flush()
+
+
+post_views = ViewCounter()
+atexit.register(post_views.flush_on_exit)
+
+
+def count_views(view):
+    """Учитывает просмотр поста, в том числе ответ 304."""
+
+    @wraps(view)
+    def wrapper(request, post_id, *args, **kwargs):
+        response = view(request, post_id, *args, **kwargs)
+        if request.method == 'GET' and response.status_code in (200, 304):
+            post_views.add(post_id)
+        return response
+    return wrapper
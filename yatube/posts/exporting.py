@@ -0,0 +1,54 @@
+import csv
+import json
+
+from .models import Post
+
+CHUNK_SIZE = 2000
+EXPORT_FIELDS = ('id', 'text', 'author', 'group', 'pub_date')
+EXPORT_VALUES = ('id', 'text', 'author__username', 'group__slug', 'pub_date')
+CONTENT_TYPES = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, chunk_size=CHUNK_SIZE):
+    rows = (
+        queryset.order_by('pk')
+        .values_list(*EXPORT_VALUES)
+        .iterator(chunk_size=chunk_size)
+    )
+    for *values, pub_date in rows:
+        yield dict(zip(EXPORT_FIELDS, (*values, pub_date.isoformat())))
+
+
+def export_jsonl(queryset, chunk_size=CHUNK_SIZE):
+    for row in iter_rows(queryset, chunk_size):
+        yield json.dumps(row, ensure_ascii=False) + '\n'
+
+
+def export_csv(queryset, chunk_size=CHUNK_SIZE):
+    writer = csv.DictWriter(Echo(), EXPORT_FIELDS)
+    yield writer.writerow(dict(zip(EXPORT_FIELDS, EXPORT_FIELDS)))
+    for row in iter_rows(queryset, chunk_size):
+        yield writer.writerow(row)
+
+
+EXPORTERS = {
+    'jsonl': export_jsonl,
+    'csv': export_csv,
+}
+
+
+def export_posts(fmt, author=None, group=None, chunk_size=CHUNK_SIZE):
+    queryset = Post.objects.all()
+    if author:
+        queryset = queryset.filter(author=author)
+    if group:
+        queryset = queryset.filter(group=group)
+    return EXPORTERS[fmt](queryset, chunk_size)
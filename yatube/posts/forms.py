@@ -1,9 +1,43 @@
 from django import forms
+from django.forms.models import ModelChoiceIterator
 
+from .cache import GROUPS_SCOPE, get_cached_choices
 from .models import Post
 
 
+class GroupChoiceIterator(ModelChoiceIterator):
+    """Варианты групп из кеша, который сбрасывается при изменении групп.
+
+    Проверка выбранного значения по-прежнему идёт через queryset.get
+    по первичному ключу, поэтому полный список из базы не читается.
+    """
+
+    def get_choices(self):
+        return get_cached_choices(
+            'group', (GROUPS_SCOPE,),
+            lambda: [self.choice(group) for group in self.queryset],
+        )
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from self.get_choices()
+
+    def __len__(self):
+        empty = self.field.empty_label is not None
+        return len(self.get_choices()) + empty
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.get_choices())
+
+
 class PostForm(forms.ModelForm):
     class Meta():
         model = Post
         fields = ('text', 'group')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        group = self.fields['group']
+        group.iterator = GroupChoiceIterator
+        group.widget.choices = group.choices
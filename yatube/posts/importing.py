@@ -0,0 +1,167 @@
+import csv
+import json
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.cache import invalidate
+
+from .cache import GROUP_SCOPE, INDEX_SCOPE, PROFILE_SCOPE
+from .counters import change_posts_count
+from .models import Group, Post, User
+from .search import deferred_indexing
+
+
+def read_jsonl(stream):
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else {}
+
+
+def read_csv(stream):
+    yield from csv.DictReader(stream)
+
+
+READERS = {
+    'jsonl': read_jsonl,
+    'csv': read_csv,
+}
+
+
+@contextmanager
+def manual_pub_date():
+    field = Post._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def parse_pub_date(value):
+    if not value:
+        return timezone.now()
+    try:
+        pub_date = parse_datetime(value)
+    except ValueError:
+        return None
+    if pub_date is not None and timezone.is_naive(pub_date):
+        pub_date = timezone.make_aware(pub_date)
+    return pub_date
+
+
+class PostImporter:
+    """Загружает посты пачками через bulk_create.
+
+    Счётчики, полнотекстовый индекс и кеш лент обновляются один раз
+    в конце импорта, а не на каждую запись.
+    """
+
+    def __init__(self, batch_size, create_missing=False):
+        self.batch_size = batch_size
+        self.create_missing = create_missing
+        self.authors = {}
+        self.groups = {}
+        self.author_counts = Counter()
+        self.group_counts = Counter()
+        self.imported = 0
+        self.skipped = 0
+
+    def run(self, records):
+        with deferred_indexing(), manual_pub_date():
+            try:
+                batch = []
+                for record in records:
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        yield self.flush(batch)
+                        batch = []
+                if batch:
+                    yield self.flush(batch)
+            finally:
+                self.finish()
+
+    def flush(self, records):
+        with transaction.atomic():
+            self.resolve(records)
+            posts = [
+                post for post in map(self.build_post, records) if post
+            ]
+            Post.objects.bulk_create(posts)
+        for post in posts:
+            self.author_counts[post.author_id] += 1
+            self.group_counts[post.group_id] += 1
+        self.imported += len(posts)
+        return len(posts)
+
+    def resolve(self, records):
+        self._resolve(
+            self.authors, User, 'username',
+            {record.get('author') for record in records},
+        )
+        self._resolve(
+            self.groups, Group, 'slug',
+            {record.get('group') for record in records},
+        )
+
+    def _resolve(self, lookup, model, field, names):
+        missing = {name for name in names if name} - lookup.keys()
+        if not missing:
+            return
+        lookup.update(
+            model.objects.filter(**{f'{field}__in': missing})
+            .values_list(field, 'pk')
+        )
+        missing -= lookup.keys()
+        if missing and self.create_missing:
+            for name in missing:
+                lookup[name] = self.create(model, name).pk
+
+    def create(self, model, name):
+        if model is User:
+            user = User(username=name)
+            user.set_unusable_password()
+            user.save()
+            return user
+        return Group.objects.create(title=name, slug=name, description='')
+
+    def build_post(self, record):
+        author_id = self.authors.get(record.get('author'))
+        group = record.get('group')
+        pub_date = parse_pub_date(record.get('pub_date'))
+        if (
+            not record.get('text') or author_id is None or pub_date is None
+            or (group and group not in self.groups)
+        ):
+            self.skipped += 1
+            return None
+        return Post(
+            text=record['text'],
+            author_id=author_id,
+            group_id=self.groups.get(group),
+            pub_date=pub_date,
+        )
+
+    def finish(self):
+        authors = {pk: name for name, pk in self.authors.items()}
+        groups = {pk: slug for slug, pk in self.groups.items()}
+        with transaction.atomic():
+            for author_id, count in self.author_counts.items():
+                change_posts_count(author_id=author_id, delta=count)
+            for group_id, count in self.group_counts.items():
+                change_posts_count(group_id=group_id, delta=count)
+        invalidate(
+            INDEX_SCOPE,
+            *(PROFILE_SCOPE.format(username=authors[pk])
+              for pk in self.author_counts),
+            *(GROUP_SCOPE.format(slug=groups[pk])
+              for pk in self.group_counts if pk is not None),
+        )
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+
+from posts.benchmark import (DEFAULT_TOLERANCE, compare, isolated_cache,
+                             load_baseline, run_benchmark, save_baseline)
+from posts.seeding import seed_dataset
+
+BASELINE = 'benchmark_baseline.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку, число запросов и размер ответа маршрутов posts '
+        'на тестовой базе со сгенерированными данными'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--authors', type=int, default=500)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Запросов на каждый маршрут')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Не сбрасывать кеш между запросами')
+        parser.add_argument('--baseline', default=BASELINE,
+                            help='Файл с базовыми результатами')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Сохранить результаты как базовые')
+        parser.add_argument('--tolerance', type=float,
+                            default=DEFAULT_TOLERANCE,
+                            help='Допустимое ухудшение задержки, доля')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Не пересоздавать тестовую базу')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options['keepdb']
+        )
+        try:
+            with isolated_cache():
+                results = self.run(options)
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options['keepdb']
+            )
+            teardown_test_environment()
+        lines, regressions = compare(
+            results, load_baseline(options['baseline']),
+            options['tolerance'],
+        )
+        for line in lines:
+            self.stdout.write(line)
+        if options['save_baseline']:
+            save_baseline(options['baseline'], results)
+            self.stdout.write(self.style.SUCCESS(
+                f'Базовые результаты сохранены в {options["baseline"]}'
+            ))
+        elif regressions:
+            raise CommandError('Ухудшение: ' + ', '.join(regressions))
+
+    def run(self, options):
+        self.stdout.write('Генерация данных…')
+        seed_dataset(
+            options['posts'], options['authors'], options['groups'],
+            seed=options['seed'],
+        )
+        self.stdout.write('Замеры…')
+        return run_benchmark(
+            options['requests'], options['seed'], options['warm_cache']
+        )
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.exporting import CHUNK_SIZE, EXPORTERS, export_posts
+from posts.models import Group, User
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты всего сайта, автора или группы в JSONL или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=EXPORTERS.keys(),
+            default='jsonl',
+            help='Формат выгрузки',
+        )
+        parser.add_argument('--author', help='Имя пользователя автора')
+        parser.add_argument('--group', help='Метка группы')
+        parser.add_argument(
+            '--output',
+            help='Путь к файлу, по умолчанию — stdout',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за раз',
+        )
+
+    def get_scope(self, author, group):
+        try:
+            return {
+                'author': author and User.objects.get(username=author),
+                'group': group and Group.objects.get(slug=group),
+            }
+        except (User.DoesNotExist, Group.DoesNotExist) as error:
+            raise CommandError(error)
+
+    def handle(self, *args, **options):
+        lines = export_posts(
+            options['format'],
+            chunk_size=options['chunk_size'],
+            **self.get_scope(options['author'], options['group']),
+        )
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(lines)
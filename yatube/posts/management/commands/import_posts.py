@@ -0,0 +1,77 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.importing import READERS, PostImporter
+
+BATCH_SIZE = 1000
+STDIN = '-'
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует посты из JSONL или CSV '
+        '(поля text, author, group, pub_date)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Путь к файлу или "-" для чтения из stdin',
+        )
+        parser.add_argument(
+            '--format',
+            choices=READERS.keys(),
+            help='Формат входных данных, по умолчанию — по расширению файла',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество постов в одной транзакции',
+        )
+        parser.add_argument(
+            '--create-missing',
+            action='store_true',
+            help='Создавать отсутствующих авторов и группы',
+        )
+
+    def get_format(self, path, fmt):
+        if fmt:
+            return fmt
+        extension = path.rsplit('.', 1)[-1].lower()
+        if extension not in READERS:
+            raise CommandError('Укажите формат через --format')
+        return extension
+
+    def open(self, path):
+        if path == STDIN:
+            return sys.stdin
+        try:
+            return open(path, encoding='utf-8', newline='')
+        except OSError as error:
+            raise CommandError(error)
+
+    def handle(self, *args, path, **options):
+        reader = READERS[self.get_format(path, options['format'])]
+        importer = PostImporter(
+            options['batch_size'], options['create_missing']
+        )
+        started = time.monotonic()
+        stream = self.open(path)
+        try:
+            for _ in importer.run(reader(stream)):
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f'Импортировано: {importer.imported}, '
+                    f'{importer.imported / elapsed:.0f} постов/с'
+                )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: импортировано {importer.imported}, '
+            f'пропущено {importer.skipped} '
+            f'за {time.monotonic() - started:.1f} с'
+        ))
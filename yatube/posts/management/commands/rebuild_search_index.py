@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import rebuild_index
+
+BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс постов пачками'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество постов в одной транзакции',
+        )
+
+    def handle(self, *args, **options):
+        for last_id in rebuild_index(options['batch_size']):
+            self.stdout.write(f'Проиндексированы посты до id={last_id}')
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен'))
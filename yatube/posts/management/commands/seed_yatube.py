@@ -0,0 +1,53 @@
+import argparse
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.seeding import BATCH_SIZE, UNTIL, seed_dataset
+
+
+def aware_datetime(value):
+    try:
+        moment = parse_datetime(value)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise argparse.ArgumentTypeError(f'некорректная дата: {value}')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.utc)
+    return moment
+
+
+class Command(BaseCommand):
+    help = 'Генерирует пользователей, группы и посты для нагрузочных тестов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Зерно генератора случайных чисел')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--until', type=aware_datetime, default=UNTIL,
+                            help='Дата самого нового поста, ISO 8601')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def progress(done):
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'Постов: {done}/{options["posts"]}, '
+                f'{done / elapsed:.0f} постов/с'
+            )
+
+        seed_dataset(
+            options['posts'], options['users'], options['groups'],
+            seed=options['seed'], batch_size=options['batch_size'],
+            until=options['until'], progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.monotonic() - started:.1f} с'
+        ))
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+# ALTER TABLE ADD COLUMN не пересоздаёт таблицу постов, поэтому
+# миграция быстрая на больших таблицах и сохраняет триггеры FTS.
+ADD_COLUMN_SQL = (
+    "ALTER TABLE posts_post ADD COLUMN updated datetime NOT NULL "
+    "DEFAULT '1970-01-01 00:00:00'",
+    'UPDATE posts_post SET updated = pub_date',
+)
+DROP_COLUMN_SQL = 'ALTER TABLE posts_post DROP COLUMN updated'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_search_index'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(ADD_COLUMN_SQL, DROP_COLUMN_SQL),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='post',
+                    name='updated',
+                    field=models.DateTimeField(
+                        auto_now=True,
+                        verbose_name='Дата изменения'
+                    ),
+                ),
+            ],
+        ),
+    ]
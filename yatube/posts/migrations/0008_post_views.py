@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+# Как и в 0007, столбец добавляется без пересоздания таблицы постов.
+ADD_COLUMN_SQL = (
+    'ALTER TABLE posts_post ADD COLUMN views integer unsigned NOT NULL '
+    'DEFAULT 0 CHECK (views >= 0)'
+)
+DROP_COLUMN_SQL = 'ALTER TABLE posts_post DROP COLUMN views'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_updated'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(ADD_COLUMN_SQL, DROP_COLUMN_SQL),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='post',
+                    name='views',
+                    field=models.PositiveIntegerField(
+                        default=0,
+                        editable=False,
+                        verbose_name='Просмотры'
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-views', '-pub_date', '-id'], name='post_views_idx'),
+        ),
+    ]
@@ -3,8 +3,57 @@ from django.db import models
 
 User = get_user_model()
 
+FEED_FIELDS = (
+    'text',
+    'pub_date',
+    'author',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'group',
+    'group__slug',
+)
 
-class Post(models.Model):
+
+class CountersModel(models.Model):
+    """Модель, счётчики которой меняются только UPDATE с F-выражениями.
+
+    Обычное сохранение загруженной строки не пишет ``counter_fields``:
+    иначе оно затёрло бы то, что прибавили после загрузки.
+    """
+
+    counter_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class PostQuerySet(models.QuerySet):
+    def feed(self):
+        return self.select_related('author', 'group').only(*FEED_FIELDS)
+
+    def popular(self):
+        return self.feed().only(*FEED_FIELDS, 'views').filter(
+            views__gt=0
+        ).order_by('-views', '-pub_date', '-pk')
+
+
+class Post(CountersModel):
     text = models.TextField(
         'Текст поста',
         help_text='Текст нового поста'
@@ -13,6 +62,10 @@ class Post(models.Model):
         'Дата публикации',
         auto_now_add=True
     )
+    updated = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -28,17 +81,53 @@ class Post(models.Model):
         verbose_name='Группа',
         help_text='Группа, к которой будет относиться пост'
     )
+    views = models.PositiveIntegerField(
+        'Просмотры',
+        default=0,
+        editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
+    # Просмотры прибавляют только пачки ViewCounter.
+    counter_fields = ('views',)
 
     class Meta:
         verbose_name = 'Публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_pub_date_idx',
+            ),
+            models.Index(
+                fields=('group', '-pub_date', '-id'),
+                name='post_group_pub_date_idx',
+            ),
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_pub_date_idx',
+            ),
+            models.Index(
+                fields=('-views', '-pub_date', '-id'),
+                name='post_views_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:15]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_keys = instance.counter_keys()
+        return instance
+
+    def counter_keys(self):
+        return self.__dict__.get('author_id'), self.__dict__.get('group_id')
 
-class Group(models.Model):
+
+class Group(CountersModel):
     title = models.CharField(
         'Заголовок',
         max_length=200
@@ -48,6 +137,13 @@ class Group(models.Model):
         unique=True
     )
     description = models.TextField('Описание')
+    posts_count = models.PositiveIntegerField(
+        'Количество постов',
+        default=0,
+        editable=False
+    )
+
+    counter_fields = ('posts_count',)
 
     class Meta:
         verbose_name = 'Группа'
@@ -55,3 +151,30 @@ class Group(models.Model):
 
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_slug = instance.__dict__.get('slug')
+        return instance
+
+
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        User,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        'Количество постов',
+        default=0
+    )
+
+    class Meta:
+        verbose_name = 'Статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'{self.author}: {self.posts_count}'
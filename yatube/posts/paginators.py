@@ -0,0 +1,163 @@
+import base64
+import binascii
+
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+CURSOR_SEPARATOR = '|'
+LAST_PAGE = 'last'
+
+
+def encode_cursor(post):
+    value = f'{post.pub_date.isoformat()}{CURSOR_SEPARATOR}{post.pk}'
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        value = base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4)
+        ).decode()
+        pub_date, pk = value.rsplit(CURSOR_SEPARATOR, 1)
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, pk
+
+
+class CursorPage(Page):
+    def __init__(self, object_list, number, paginator,
+                 has_next=None, has_previous=None):
+        super().__init__(list(object_list), number, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def has_next(self):
+        if self._has_next is None:
+            return super().has_next()
+        return self._has_next
+
+    def has_previous(self):
+        if self._has_previous is None:
+            return super().has_previous()
+        return self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self.has_next() or not self.object_list:
+            return None
+        return encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous() or not self.object_list:
+            return None
+        return encode_cursor(self.object_list[0])
+
+
+class WindowedPaginator(Paginator):
+    ELLIPSIS = '…'
+    ON_EACH_SIDE = 2
+    ON_ENDS = 1
+
+    def get_elided_page_range(self, number):
+        """Номера страниц вокруг текущей и по краям, пропуски — ELLIPSIS."""
+        number = self.validate_number(number)
+        on_each_side, on_ends = self.ON_EACH_SIDE, self.ON_ENDS
+        if self.num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
+
+
+class CursorPaginator(WindowedPaginator):
+    """Постраничный вывод по ключу (pub_date, id) без COUNT и OFFSET.
+
+    Номер страницы в ``?page=`` поддерживается для старых ссылок и
+    работает через OFFSET, как обычный ``Paginator``.
+    """
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(
+            object_list.order_by('-pub_date', '-pk'), per_page, **kwargs
+        )
+        if count is not None:
+            self.count = count
+
+    def get_page(self, number=None, after=None, before=None):
+        after = decode_cursor(after)
+        if after is not None:
+            return self.page_after(*after)
+        before = decode_cursor(before)
+        if before is not None:
+            return self.page_before(*before)
+        if number == LAST_PAGE:
+            return self.last_page()
+        if number is not None:
+            return super().get_page(number)
+        return self.first_page()
+
+    def first_page(self, rows=None):
+        """Первая страница; ``rows`` — уже выбранные per_page + 1 строк."""
+        if rows is None:
+            return self._keyset_page(self.object_list, has_previous=False)
+        return self._rows_page(rows, has_previous=False)
+
+    def last_page(self):
+        return self._reversed_keyset_page(self.object_list, has_next=False)
+
+    def page_after(self, pub_date, pk):
+        return self._keyset_page(
+            self.object_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            ),
+            has_previous=True,
+        )
+
+    def page_before(self, pub_date, pk):
+        return self._reversed_keyset_page(
+            self.object_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            ),
+            has_next=True,
+        )
+
+    def _keyset_page(self, queryset, has_previous):
+        return self._rows_page(
+            list(queryset[:self.per_page + 1]), has_previous
+        )
+
+    def _rows_page(self, rows, has_previous):
+        return CursorPage(
+            rows[:self.per_page], None, self,
+            has_next=len(rows) > self.per_page,
+            has_previous=has_previous,
+        )
+
+    def _reversed_keyset_page(self, queryset, has_next):
+        rows = list(queryset.reverse()[:self.per_page + 1])
+        return CursorPage(
+            reversed(rows[:self.per_page]), None, self,
+            has_next=has_next,
+            has_previous=len(rows) > self.per_page,
+        )
+
+    def _get_page(self, *args, **kwargs):
+        return CursorPage(*args, **kwargs)
@@ -0,0 +1,134 @@
+import re
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_TOKENS = 16
+TERM_PATTERN = re.compile(r'\w+')
+
+MATCH_SQL = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+COUNT_SQL = f'SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+RESULTS_SQL = (
+    f"SELECT rowid, snippet({FTS_TABLE}, 0, "
+    f"'{SNIPPET_START}', '{SNIPPET_END}', '…', {SNIPPET_TOKENS}) "
+    f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+    f'ORDER BY rank LIMIT %s OFFSET %s'
+)
+CLEAR_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('delete-all')"
+MAX_ID_SQL = 'SELECT MAX(id) FROM posts_post'
+BATCH_END_SQL = (
+    'SELECT MAX(id) FROM (SELECT id FROM posts_post '
+    'WHERE id > %s AND id <= %s ORDER BY id LIMIT %s)'
+)
+FILL_BATCH_SQL = (
+    f'INSERT INTO {FTS_TABLE}(rowid, text) '
+    f'SELECT id, text FROM posts_post WHERE id > %s AND id <= %s'
+)
+INSERT_TRIGGER = 'posts_post_fts_insert'
+DROP_INSERT_TRIGGER_SQL = f'DROP TRIGGER IF EXISTS {INSERT_TRIGGER}'
+CREATE_INSERT_TRIGGER_SQL = (
+    f'CREATE TRIGGER {INSERT_TRIGGER} AFTER INSERT ON posts_post BEGIN '
+    f'INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text); '
+    f'END'
+)
+
+
+def build_match(query):
+    terms = TERM_PATTERN.findall(query or '')
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def highlight(snippet):
+    return mark_safe(
+        escape(snippet)
+        .replace(SNIPPET_START, '<mark>')
+        .replace(SNIPPET_END, '</mark>')
+    )
+
+
+def filter_posts(queryset, query):
+    match = build_match(query)
+    if not match:
+        return queryset.none()
+    return queryset.filter(pk__in=RawSQL(MATCH_SQL, (match,)))
+
+
+class SearchResults:
+    """Результаты полнотекстового поиска в порядке релевантности.
+
+    Поддерживает ``count()`` и срезы, поэтому подходит для
+    ``Paginator``; посты загружаются только для запрошенной страницы.
+    """
+
+    def __init__(self, query):
+        self.match = build_match(query)
+
+    def count(self):
+        if not self.match:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(COUNT_SQL, (self.match,))
+            return cursor.fetchone()[0]
+
+    def __getitem__(self, item):
+        if not self.match:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(RESULTS_SQL, (
+                self.match, item.stop - item.start, item.start,
+            ))
+            rows = cursor.fetchall()
+        posts = Post.objects.feed().in_bulk([pk for pk, _ in rows])
+        results = []
+        for pk, snippet in rows:
+            if pk in posts:
+                posts[pk].snippet = highlight(snippet)
+                results.append(posts[pk])
+        return results
+
+
+def rebuild_index(batch_size):
+    """Заполняет индекс заново пачками, возвращая id последнего поста.
+
+    Посты, созданные во время перестроения, попадают в индекс триггером.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(MAX_ID_SQL)
+        max_id = cursor.fetchone()[0] or 0
+        cursor.execute(CLEAR_SQL)
+    last_id = 0
+    while last_id < max_id:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(BATCH_END_SQL, (last_id, max_id, batch_size))
+            batch_end = cursor.fetchone()[0] or max_id
+            cursor.execute(FILL_BATCH_SQL, (last_id, batch_end))
+        last_id = batch_end
+        yield last_id
+
+
+@contextmanager
+def deferred_indexing():
+    """Отключает индексацию новых постов и догоняет индекс при выходе.
+
+    Изменения и удаления старых постов продолжают индексироваться.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(MAX_ID_SQL)
+        start_id = cursor.fetchone()[0] or 0
+        cursor.execute(DROP_INSERT_TRIGGER_SQL)
+    try:
+        yield
+    finally:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(CREATE_INSERT_TRIGGER_SQL)
+            cursor.execute(MAX_ID_SQL)
+            end_id = cursor.fetchone()[0] or 0
+            cursor.execute(FILL_BATCH_SQL, (start_id, end_id))
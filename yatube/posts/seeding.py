@@ -0,0 +1,103 @@
+import itertools
+import random
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from core.cache import invalidate
+
+from .cache import INDEX_SCOPE, USERS_SCOPE
+from .counters import rebuild_posts_counts
+from .importing import manual_pub_date
+from .models import Group, Post, User
+from .search import deferred_indexing
+
+BATCH_SIZE = 5000
+TEXTS_POOL_SIZE = 5000
+DATES_SPREAD = timedelta(days=3 * 365)
+UNTIL = datetime(2022, 1, 1, tzinfo=timezone.utc)
+AUTHORS_EXPONENT = 1.0
+GROUPS_EXPONENT = 0.8
+NO_GROUP_SHARE = 0.2
+
+
+def zipf_cum_weights(size, exponent):
+    return list(itertools.accumulate(
+        1 / rank ** exponent for rank in range(1, size + 1)
+    ))
+
+
+def iter_pub_dates(rng, count, until=UNTIL, spread=DATES_SPREAD):
+    """Даты по возрастанию, чаще ближе к ``until``: активность растёт."""
+    start = until - spread
+    seconds = spread.total_seconds()
+    for i in range(count):
+        share = ((i + rng.random()) / count) ** 0.5
+        yield start + timedelta(seconds=seconds * share)
+
+
+def create_users(fake, seed, count):
+    User.objects.bulk_create(
+        User(username=f'user{seed}_{i}',
+             first_name=fake.first_name(),
+             last_name=fake.last_name())
+        for i in range(count)
+    )
+    return list(User.objects.filter(
+        username__startswith=f'user{seed}_'
+    ).order_by('pk').values_list('pk', flat=True))
+
+
+def create_groups(fake, seed, count):
+    Group.objects.bulk_create(
+        Group(title=fake.sentence(nb_words=3)[:200],
+              slug=f'group-{seed}-{i}',
+              description=fake.text())
+        for i in range(count)
+    )
+    return list(Group.objects.filter(
+        slug__startswith=f'group-{seed}-'
+    ).order_by('pk').values_list('pk', flat=True))
+
+
+def seed_dataset(posts, authors, groups, seed=0, batch_size=BATCH_SIZE,
+                 until=UNTIL, progress=None):
+    """Наполняет базу авторами, группами и постами.
+
+    Посты распределены между авторами и группами по закону Ципфа,
+    даты растянуты на три года до ``until``. При одинаковых аргументах
+    данные совпадают на любой машине.
+    """
+    fake = Faker('ru_RU')
+    fake.seed_instance(seed)
+    rng = random.Random(seed)
+    with transaction.atomic():
+        author_ids = create_users(fake, seed, authors)
+        group_ids = create_groups(fake, seed, groups)
+    authors_weights = zipf_cum_weights(len(author_ids), AUTHORS_EXPONENT)
+    groups_weights = zipf_cum_weights(len(group_ids), GROUPS_EXPONENT)
+    texts = [fake.text() for _ in range(TEXTS_POOL_SIZE)]
+    pub_dates = iter_pub_dates(rng, posts, until)
+
+    def build_post():
+        group_id = None
+        if group_ids and rng.random() >= NO_GROUP_SHARE:
+            group_id = rng.choices(group_ids, cum_weights=groups_weights)[0]
+        return Post(
+            text=rng.choice(texts),
+            author_id=rng.choices(author_ids, cum_weights=authors_weights)[0],
+            group_id=group_id,
+            pub_date=next(pub_dates),
+        )
+
+    with deferred_indexing(), manual_pub_date():
+        for start in range(0, posts, batch_size):
+            size = min(batch_size, posts - start)
+            with transaction.atomic():
+                Post.objects.bulk_create(build_post() for _ in range(size))
+            if progress:
+                progress(start + size)
+    rebuild_posts_counts()
+    invalidate(INDEX_SCOPE, USERS_SCOPE)
@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import invalidate_on_commit
+
+from .cache import (GROUP_FEED, GROUP_SCOPE, GROUPS_SCOPE, INDEX_FEED,
+                    PROFILE_FEED, USERS_SCOPE, feed_scopes)
+from .counters import change_posts_count
+from .feeds import finish_feeds_update, start_feeds_update
+from .models import Group, Post, User
+
+
+def get_feeds(author_ids, group_ids):
+    slugs = Group.objects.filter(pk__in=group_ids).values_list('pk', 'slug')
+    usernames = User.objects.filter(pk__in=author_ids).values_list(
+        'pk', 'username'
+    )
+    return [
+        (INDEX_FEED, ()),
+        *((feed_scopes(GROUP_FEED, slug=slug), (('group_id', pk),))
+          for pk, slug in slugs),
+        *((feed_scopes(PROFILE_FEED, username=name), (('author_id', pk),))
+          for pk, name in usernames),
+    ]
+
+
+def invalidate_feeds(post_id, *keys):
+    author_ids, group_ids = zip(*keys)
+    feeds = get_feeds(author_ids, group_ids)
+    bases = start_feeds_update(feeds)
+    transaction.on_commit(
+        lambda: finish_feeds_update(feeds, bases, post_id)
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_counters_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    keys = instance.counter_keys()
+    if created:
+        change_posts_count(*keys, delta=1)
+    elif hasattr(instance, '_loaded_keys'):
+        old_author_id, old_group_id = instance._loaded_keys
+        author_id, group_id = keys
+        if old_author_id != author_id:
+            change_posts_count(author_id=old_author_id, delta=-1)
+            change_posts_count(author_id=author_id, delta=1)
+        if old_group_id != group_id:
+            change_posts_count(group_id=old_group_id, delta=-1)
+            change_posts_count(group_id=group_id, delta=1)
+    invalidate_feeds(
+        instance.pk, keys, getattr(instance, '_loaded_keys', keys)
+    )
+    instance._loaded_keys = keys
+
+
+@receiver(post_delete, sender=Post)
+def update_counters_on_delete(sender, instance, **kwargs):
+    keys = getattr(instance, '_loaded_keys', instance.counter_keys())
+    change_posts_count(*keys, delta=-1)
+    invalidate_feeds(instance.pk, keys)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_feeds(sender, instance, **kwargs):
+    invalidate_on_commit(
+        GROUPS_SCOPE,
+        GROUP_SCOPE.format(slug=instance.slug),
+        GROUP_SCOPE.format(slug=getattr(instance, '_loaded_slug', '')),
+    )
+    instance._loaded_slug = instance.slug
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_feeds(sender, instance, created, update_fields,
+                          **kwargs):
+    if created or update_fields == frozenset(('last_login',)):
+        return
+    invalidate_on_commit(USERS_SCOPE)
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.db.models import Count
+from django.test import TestCase
+
+from posts.benchmark import compare, isolated_cache, run_benchmark
+from posts.models import Group, Post, User
+from posts.seeding import seed_dataset
+
+METRICS = {'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'bytes'}
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_seed_is_reproducible(self):
+        seed_dataset(30, 3, 2, seed=1)
+        first = list(Post.objects.order_by('pk').values_list(
+            'text', 'author__username', 'group__slug', 'pub_date'
+        ))
+        Post.objects.all().delete()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        seed_dataset(30, 3, 2, seed=1)
+        second = list(Post.objects.order_by('pk').values_list(
+            'text', 'author__username', 'group__slug', 'pub_date'
+        ))
+        self.assertEqual(first, second)
+
+    def test_run_benchmark_reports_every_route(self):
+        seed_dataset(30, 3, 2)
+        results = run_benchmark(requests=2)
+        self.assertIn('index', results)
+        self.assertIn('post_edit', results)
+        for name, result in results.items():
+            with self.subTest(route=name):
+                self.assertEqual(set(result), METRICS)
+
+    def test_benchmark_does_not_touch_configured_cache(self):
+        cache.set('key', 'value')
+        with isolated_cache():
+            cache.clear()
+            cache.set('other', 'value')
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertIsNone(cache.get('other'))
+
+    def test_compare_flags_regressions(self):
+        baseline = {'index': {'p95_ms': 10, 'queries': 1}}
+        _, regressions = compare(
+            {'index': {'p95_ms': 11, 'queries': 2}}, baseline, 0.2
+        )
+        self.assertEqual(regressions, ['index.queries'])
+
+    def test_seed_distributions(self):
+        seed_dataset(2000, 50, 10)
+        counts = sorted(
+            User.objects.annotate(count=Count('posts'))
+            .values_list('count', flat=True),
+            reverse=True,
+        )
+        self.assertGreater(counts[0], 10 * counts[len(counts) // 2])
+        dates = list(Post.objects.order_by('pk').values_list(
+            'pub_date', flat=True
+        ))
+        self.assertEqual(dates, sorted(dates))
+        self.assertTrue(Post.objects.filter(group=None).exists())
@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+AUTHOR = 'auth'
+GROUP_DESCRIPTION = 'Тестовое описание'
+GROUP_SLUG = 'test-slug'
+GROUP_TITLE = 'Тестовая группа'
+GROUP_TITLE_EDITED = 'Новое название группы'
+POST_TEXT = 'Тестовый пост'
+POST_TEXT_NEW = 'Новый пост'
+REVERSE_INDEX = reverse('posts:index')
+
+
+class FeedCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        cls.group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text=POST_TEXT,
+            group=cls.group,
+        )
+        cls.feeds = (
+            REVERSE_INDEX,
+            reverse('posts:group_list', args=(cls.group.slug,)),
+            reverse('posts:profile', args=(cls.author,)),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_repeat_reads_do_not_query(self):
+        for url in self.feeds:
+            with self.subTest(url=url):
+                content = self.guest_client.get(url).content
+                with self.assertNumQueries(0):
+                    response = self.guest_client.get(url)
+                self.assertEqual(response.content, content)
+
+    def test_pages_are_cached_separately(self):
+        anonymous = self.guest_client.get(REVERSE_INDEX).content
+        authorized = self.authorized_client.get(REVERSE_INDEX).content
+        self.assertNotEqual(anonymous, authorized)
+        self.assertEqual(
+            self.guest_client.get(REVERSE_INDEX).content, anonymous
+        )
+
+    def test_new_post_invalidates_feeds(self):
+        for url in self.feeds:
+            self.guest_client.get(url)
+        Post.objects.create(
+            author=self.author,
+            text=POST_TEXT_NEW,
+            group=self.group,
+        )
+        for url in self.feeds:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, POST_TEXT_NEW)
+
+    def test_deleted_post_leaves_feeds(self):
+        for url in self.feeds:
+            self.guest_client.get(url)
+        self.post.delete()
+        for url in self.feeds:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertNotContains(response, POST_TEXT)
+
+    def test_group_change_invalidates_group_page(self):
+        url = reverse('posts:group_list', args=(self.group.slug,))
+        self.guest_client.get(url)
+        self.group.title = GROUP_TITLE_EDITED
+        self.group.save()
+        self.assertContains(self.guest_client.get(url), GROUP_TITLE_EDITED)
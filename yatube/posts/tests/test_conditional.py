@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+AUTHOR = 'auth'
+GROUP_DESCRIPTION = 'Тестовое описание'
+GROUP_SLUG = 'test-slug'
+GROUP_TITLE = 'Тестовая группа'
+POST_TEXT = 'Тестовый пост'
+POST_TEXT_EDITED = 'Отредактированный пост'
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        cls.group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+        cls.post = Post.objects.create(
+            author=cls.author,
+            text=POST_TEXT,
+            group=cls.group,
+        )
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(cls.group.slug,)),
+            reverse('posts:profile', args=(cls.author,)),
+            reverse('posts:post_detail', args=(cls.post.pk,)),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def get_etags(self):
+        return {url: self.guest_client.get(url)['ETag'] for url in self.urls}
+
+    def test_not_modified(self):
+        for url, etag in self.get_etags().items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+                self.assertEqual(response.content, b'')
+
+    def test_edit_changes_etag(self):
+        etags = self.get_etags()
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=(self.post.pk,)),
+            data={'text': POST_TEXT_EDITED, 'group': self.group.pk},
+        )
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertContains(response, POST_TEXT_EDITED)
+
+    def test_etag_depends_on_user(self):
+        for url, etag in self.get_etags().items():
+            with self.subTest(url=url):
+                response = self.authorized_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_edit_sets_updated(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = POST_TEXT_EDITED
+        post.save()
+        self.assertGreater(post.updated, self.post.updated)
@@ -0,0 +1,103 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import AuthorStats, Group, Post, User
+
+AUTHOR = 'auth'
+GROUP_DESCRIPTION = 'Тестовое описание'
+GROUP_SLUG = 'test-slug'
+GROUP_TITLE = 'Тестовая группа'
+GROUP_ANOTHER_SLUG = 'another-slug'
+POST_TEXT = 'Тестовый пост'
+REVERSE_POST_CREATE = reverse('posts:post_create')
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        cls.group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+        cls.another_group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_ANOTHER_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def assertCounts(self, author_count, group_count, another_group_count):
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).posts_count,
+            author_count,
+        )
+        self.group.refresh_from_db()
+        self.another_group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, group_count)
+        self.assertEqual(self.another_group.posts_count, another_group_count)
+
+    def test_counters_follow_create_edit_delete(self):
+        self.authorized_client.post(
+            REVERSE_POST_CREATE,
+            data={'text': POST_TEXT, 'group': self.group.pk},
+        )
+        self.assertCounts(1, 1, 0)
+        post = Post.objects.get()
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=(post.pk,)),
+            data={'text': POST_TEXT, 'group': self.another_group.pk},
+        )
+        self.assertCounts(1, 0, 1)
+        Post.objects.get().delete()
+        self.assertCounts(0, 0, 0)
+
+    def test_delete_after_drift_to_zero(self):
+        post = Post.objects.create(author=self.author, text=POST_TEXT,
+                                   group=self.group)
+        AuthorStats.objects.update(posts_count=0)
+        Group.objects.update(posts_count=0)
+        post.delete()
+        self.assertCounts(0, 0, 0)
+
+    def test_regroup_after_drift_to_zero(self):
+        post = Post.objects.create(author=self.author, text=POST_TEXT,
+                                   group=self.group)
+        Group.objects.update(posts_count=0)
+        post.group = self.another_group
+        post.save()
+        self.assertCounts(1, 0, 1)
+
+    def test_group_save_keeps_counter(self):
+        group = Group.objects.get(pk=self.group.pk)
+        Post.objects.create(author=self.author, text=POST_TEXT,
+                            group=self.group)
+        group.description = GROUP_DESCRIPTION * 2
+        group.save()
+        self.assertCounts(1, 1, 0)
+
+    def test_rebuild_command_fixes_drift(self):
+        Post.objects.create(author=self.author, text=POST_TEXT,
+                            group=self.group)
+        AuthorStats.objects.update(posts_count=10)
+        Group.objects.update(posts_count=10)
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertCounts(1, 1, 0)
+
+    def test_profile_shows_counter(self):
+        Post.objects.create(author=self.author, text=POST_TEXT)
+        AuthorStats.objects.update(posts_count=42)
+        response = self.authorized_client.get(
+            reverse('posts:profile', args=(self.author,))
+        )
+        self.assertEqual(response.context['posts_count'], 42)
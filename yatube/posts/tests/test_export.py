@@ -0,0 +1,85 @@
+import csv
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+AUTHOR = 'auth'
+NOT_AUTHOR = 'not_author'
+GROUP_DESCRIPTION = 'Тестовое описание'
+GROUP_SLUG = 'test-slug'
+GROUP_TITLE = 'Тестовая группа'
+POST_TEXT = 'Тестовый пост'
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        cls.not_author = User.objects.create_user(username=NOT_AUTHOR)
+        cls.group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+        cls.group_post = Post.objects.create(
+            author=cls.author,
+            text=f'{POST_TEXT} "в группе"',
+            group=cls.group,
+        )
+        cls.post = Post.objects.create(author=cls.author, text=POST_TEXT)
+        Post.objects.create(author=cls.not_author, text=POST_TEXT)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def get_content(self, url):
+        response = self.guest_client.get(url)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_profile_export_jsonl(self):
+        content = self.get_content(
+            reverse('posts:export_profile', args=(self.author, 'jsonl'))
+        )
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(
+            [row['id'] for row in rows],
+            [self.group_post.pk, self.post.pk],
+        )
+        self.assertEqual(rows[0]['group'], GROUP_SLUG)
+        self.assertEqual(rows[0]['author'], AUTHOR)
+
+    def test_group_export_csv(self):
+        content = self.get_content(
+            reverse('posts:export_group', args=(GROUP_SLUG, 'csv'))
+        )
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['text'], self.group_post.text)
+
+    def test_unknown_format_and_site_export_access(self):
+        urls = (
+            reverse('posts:export_group', args=(GROUP_SLUG, 'xml')),
+            reverse('posts:export_all', args=('jsonl',)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertNotEqual(response.status_code, 200)
+
+    def test_command_round_trip(self):
+        output = StringIO()
+        call_command('export_posts', format='csv', stdout=output)
+        rows = list(csv.DictReader(StringIO(output.getvalue())))
+        self.assertEqual(len(rows), Post.objects.count())
+        output = StringIO()
+        call_command('export_posts', author=NOT_AUTHOR, stdout=output)
+        self.assertEqual(len(output.getvalue().splitlines()), 1)
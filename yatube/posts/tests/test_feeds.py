@@ -0,0 +1,96 @@
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+GROUP_SLUG = 'test-slug'
+NEW_TEXT = 'Новый пост'
+EDITED_TEXT = 'Отредактированный пост'
+POST_TEXT = 'Тестовый пост'
+# Реплики нет в DATABASES: любое чтение с неё завершилось бы ошибкой.
+REPLICA = 'lagging_replica'
+
+
+class WriteThroughFeedTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='auth')
+        self.group = Group.objects.create(
+            title='Тестовая группа', slug=GROUP_SLUG, description='Описание'
+        )
+        self.post = Post.objects.create(
+            author=self.author, group=self.group, text=POST_TEXT
+        )
+        self.client = Client()
+        self.client.force_login(self.author)
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(GROUP_SLUG,)),
+            reverse('posts:profile', args=(self.author,)),
+        )
+        for url in self.urls:
+            self.client.get(url)
+
+    def get_without_posts_query(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertFalse(any(
+            'FROM "posts_post"' in query['sql'] for query in context
+        ))
+        return response
+
+    def test_created_post_is_prepended(self):
+        self.client.post(
+            reverse('posts:post_create'),
+            {'text': NEW_TEXT, 'group': self.group.pk},
+        )
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.get_without_posts_query(url)
+                page = response.context['page_obj']
+                self.assertEqual(page[0].text, NEW_TEXT)
+                self.assertEqual(page[1], self.post)
+
+    def test_edited_post_is_replaced(self):
+        self.client.post(
+            reverse('posts:post_edit', args=(self.post.pk,)),
+            {'text': EDITED_TEXT, 'group': self.group.pk},
+        )
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.get_without_posts_query(url)
+                self.assertContains(response, EDITED_TEXT)
+                self.assertNotContains(response, POST_TEXT)
+
+    def test_post_leaves_old_group_feed(self):
+        self.client.post(
+            reverse('posts:post_edit', args=(self.post.pk,)),
+            {'text': EDITED_TEXT},
+        )
+        response = self.get_without_posts_query(self.urls[1])
+        self.assertEqual(len(response.context['page_obj']), 0)
+
+    def test_deleted_post_is_removed(self):
+        self.post.delete()
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.get_without_posts_query(url)
+                self.assertEqual(len(response.context['page_obj']), 0)
+
+    def test_post_saved_outside_request_is_read_from_primary(self):
+        with self.settings(DATABASE_REPLICAS=[REPLICA]):
+            # Как в shell или потоке очереди записей: коммит без
+            # RoutingState запроса.
+            with transaction.atomic():
+                Post.objects.create(
+                    author=self.author, group=self.group, text=NEW_TEXT
+                )
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.get_without_posts_query(url)
+                self.assertEqual(
+                    response.context['page_obj'][0].text, NEW_TEXT
+                )
@@ -0,0 +1,70 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.forms import PostForm
+from posts.models import Group, User
+
+GROUP_DESCRIPTION = 'Тестовое описание'
+GROUP_SLUG = 'test-slug'
+GROUP_TITLE = 'Тестовая группа'
+REVERSE_POST_CREATE = reverse('posts:post_create')
+REVERSE_AUTOCOMPLETE = reverse('posts:group_autocomplete')
+
+
+class GroupChoicesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_choices_are_cached(self):
+        self.authorized_client.get(REVERSE_POST_CREATE)
+        with CaptureQueriesContext(connection) as context:
+            response = self.authorized_client.get(REVERSE_POST_CREATE)
+        self.assertContains(response, GROUP_TITLE)
+        self.assertFalse(any(
+            'posts_group' in query['sql'] for query in context
+        ))
+
+    def test_choices_are_refreshed_on_group_change(self):
+        self.assertEqual(len(PostForm().fields['group'].choices), 2)
+        group = Group.objects.create(
+            title='Новая группа', slug='new', description=GROUP_DESCRIPTION
+        )
+        choices = list(PostForm().fields['group'].choices)
+        self.assertIn((group.pk, group.title), choices)
+        group.delete()
+        self.assertEqual(len(PostForm().fields['group'].choices), 2)
+
+    def test_group_is_validated_by_pk(self):
+        form = PostForm({'text': 'Текст', 'group': self.group.pk})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['group'], self.group)
+        form = PostForm({'text': 'Текст', 'group': self.group.pk + 100})
+        self.assertIn('group', form.errors)
+
+    def test_autocomplete(self):
+        response = self.authorized_client.get(
+            REVERSE_AUTOCOMPLETE, {'q': GROUP_SLUG.split('-')[0]}
+        )
+        self.assertEqual(response.json(), {'results': []})
+        response = self.authorized_client.get(
+            REVERSE_AUTOCOMPLETE, {'q': 'группа'}
+        )
+        self.assertEqual(
+            response.json(),
+            {'results': [{'id': self.group.pk, 'title': GROUP_TITLE}]},
+        )
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import AuthorStats, Group, Post, User
+from posts.search import SearchResults
+
+AUTHOR = 'auth'
+GROUP_DESCRIPTION = 'Тестовое описание'
+GROUP_SLUG = 'test-slug'
+GROUP_TITLE = 'Тестовая группа'
+PUB_DATE = '2020-01-02T03:04:05+00:00'
+RECORDS = (
+    {'text': 'Импортированный пост', 'author': AUTHOR,
+     'group': GROUP_SLUG, 'pub_date': PUB_DATE},
+    {'text': 'Второй пост', 'author': AUTHOR},
+    {'text': 'Пост нового автора', 'author': 'new_author',
+     'group': 'new-group'},
+    {'text': '', 'author': AUTHOR},
+    {'text': 'Плохая дата', 'author': AUTHOR, 'pub_date': '2020-13-45'},
+)
+
+
+class ImportPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        cls.group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def import_posts(self, content, suffix, **options):
+        with tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, delete=False, encoding='utf-8'
+        ) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        call_command(
+            'import_posts', file.name, batch_size=2, stdout=StringIO(),
+            **options
+        )
+
+    def test_import_jsonl(self):
+        content = '\n'.join(map(json.dumps, RECORDS)) + '\nnot json\n'
+        self.import_posts(content, '.jsonl')
+        self.assertEqual(Post.objects.count(), 2)
+        post = Post.objects.get(group=self.group)
+        self.assertEqual(post.pub_date.isoformat(), PUB_DATE)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).posts_count, 2
+        )
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 1)
+        self.assertEqual(SearchResults('импортированный').count(), 1)
+
+    def test_import_csv_creates_missing(self):
+        content = 'text,author,group\nПост нового автора,new_author,new\n'
+        self.import_posts(content, '.csv', create_missing=True)
+        post = Post.objects.get()
+        self.assertEqual(post.author.username, 'new_author')
+        self.assertEqual(post.group.slug, 'new')
+        self.assertEqual(post.author.stats.posts_count, 1)
+        self.assertEqual(post.group.posts_count, 1)
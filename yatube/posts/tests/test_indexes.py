@@ -0,0 +1,67 @@
+from django.db import connection
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+AUTHOR = 'auth'
+GROUP_DESCRIPTION = 'Тестовое описание'
+GROUP_SLUG = 'test-slug'
+GROUP_TITLE = 'Тестовая группа'
+POST_TEXT = 'Тестовый пост'
+POSTS_TABLE = 'FROM "posts_post"'
+
+
+class FeedIndexesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        cls.group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+        for i in range(15):
+            Post.objects.create(
+                author=cls.author,
+                text=f'{POST_TEXT} {i}',
+                group=cls.group,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def get_feed_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            page_obj = self.guest_client.get(url).context['page_obj']
+        return page_obj, [
+            query['sql'] for query in context.captured_queries
+            if POSTS_TABLE in query['sql']
+        ]
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return ' '.join(str(row[-1]) for row in cursor.fetchall())
+
+    def test_feeds_use_indexes(self):
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author,)),
+        )
+        for url in urls:
+            page_obj, queries = self.get_feed_queries(url)
+            _, next_queries = self.get_feed_queries(
+                f'{url}?after={page_obj.next_cursor}'
+            )
+            _, last_queries = self.get_feed_queries(f'{url}?page=last')
+            for sql in (*queries, *next_queries, *last_queries):
+                with self.subTest(url=url, sql=sql):
+                    plan = self.explain(sql)
+                    self.assertIn('INDEX post_', plan)
+                    self.assertNotIn('TEMP B-TREE', plan)
@@ -0,0 +1,91 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+from posts.paginators import CursorPaginator, WindowedPaginator
+
+AUTHOR = 'auth'
+CONTEXT = 'page_obj'
+POSTS_COUNT = 25
+POST_TEXT = 'Тестовый пост'
+ELLIPSIS = WindowedPaginator.ELLIPSIS
+REVERSE_INDEX = reverse('posts:index')
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        for i in range(POSTS_COUNT):
+            Post.objects.create(author=cls.author, text=f'{POST_TEXT} {i}')
+        cls.posts = list(Post.objects.order_by('-pub_date', '-pk'))
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def get_page(self, **params):
+        response = self.guest_client.get(REVERSE_INDEX, params)
+        return response.context[CONTEXT]
+
+    def test_pages_follow_cursors(self):
+        page = self.get_page()
+        self.assertEqual(list(page), self.posts[:10])
+        self.assertFalse(page.has_previous())
+        page = self.get_page(after=page.next_cursor)
+        self.assertEqual(list(page), self.posts[10:20])
+        page = self.get_page(after=page.next_cursor)
+        self.assertEqual(list(page), self.posts[20:])
+        self.assertFalse(page.has_next())
+        page = self.get_page(before=page.previous_cursor)
+        self.assertEqual(list(page), self.posts[10:20])
+        page = self.get_page(before=page.previous_cursor)
+        self.assertEqual(list(page), self.posts[:10])
+        self.assertFalse(page.has_previous())
+
+    def test_numbered_page_links(self):
+        response = self.guest_client.get(REVERSE_INDEX, {'page': 2})
+        self.assertContains(response, 'href="?page=1"')
+        self.assertContains(response, 'href="?page=3"')
+        self.assertContains(response, 'href="?after=')
+
+    def test_last_page(self):
+        page = self.get_page(page='last')
+        self.assertEqual(list(page), self.posts[-10:])
+        self.assertFalse(page.has_next())
+        self.assertTrue(page.has_previous())
+
+    def test_invalid_cursor_returns_first_page(self):
+        for cursor in ('', 'garbage', '!!!', 'MjAyMHwx'):
+            with self.subTest(cursor=cursor):
+                page = self.get_page(after=cursor)
+                self.assertEqual(list(page), self.posts[:10])
+
+    def test_keyset_page_does_not_count(self):
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        cursor = paginator.get_page().next_cursor
+        with self.assertNumQueries(1):
+            page = paginator.get_page(after=cursor)
+        self.assertEqual(len(page), 10)
+
+
+class WindowedPaginatorTests(TestCase):
+    def test_elided_page_range(self):
+        paginator = WindowedPaginator(range(200000), 10)
+        page_ranges = {
+            1: [1, 2, 3, ELLIPSIS, 20000],
+            6: [1, ELLIPSIS, 4, 5, 6, 7, 8, ELLIPSIS, 20000],
+            20000: [1, ELLIPSIS, 19998, 19999, 20000],
+        }
+        for number, expected in page_ranges.items():
+            with self.subTest(number=number):
+                self.assertEqual(
+                    list(paginator.get_elided_page_range(number)),
+                    expected,
+                )
+
+    def test_short_range_is_not_elided(self):
+        paginator = WindowedPaginator(range(30), 10)
+        self.assertEqual(list(paginator.get_elided_page_range(2)), [1, 2, 3])
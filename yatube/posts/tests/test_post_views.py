@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.routers import RoutingState, routing_state
+from posts.counters import post_views
+from posts.models import Post, User
+
+AUTHOR = 'auth'
+POSTS = 3
+POST_TEXT_EDITED = 'Отредактированный пост'
+
+
+class PostViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        cls.posts = [
+            Post.objects.create(author=cls.author, text=f'Пост {index}')
+            for index in range(POSTS)
+        ]
+        cls.post = cls.posts[0]
+        cls.url = reverse('posts:post_detail', args=(cls.post.pk,))
+
+    def setUp(self):
+        cache.clear()
+        post_views.reset()
+        self.guest_client = Client()
+
+    def test_views_are_buffered(self):
+        self.guest_client.get(self.url)
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.context['views'], 1)
+        self.assertEqual(post_views.get(self.post.pk), 2)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+
+    def test_not_modified_is_counted(self):
+        etag = self.guest_client.get(self.url)['ETag']
+        self.guest_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(post_views.get(self.post.pk), 2)
+
+    def test_missing_post_is_not_counted(self):
+        self.guest_client.get(reverse('posts:post_detail', args=(0,)))
+        self.assertEqual(post_views.get(0), 0)
+
+    def test_flush_updates_posts_in_one_statement(self):
+        for index, post in enumerate(self.posts):
+            for _ in range(index + 1):
+                post_views.add(post.pk)
+        with CaptureQueriesContext(connection) as context:
+            post_views.flush()
+        updates = [
+            query for query in context
+            if query['sql'].startswith('UPDATE')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            list(Post.objects.order_by('pk').values_list('views', flat=True)),
+            list(range(1, POSTS + 1)),
+        )
+        self.assertEqual(post_views.get(self.post.pk), 0)
+
+    def test_flush_on_interval(self):
+        with self.settings(VIEWS_FLUSH_INTERVAL=0):
+            self.guest_client.get(self.url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+    def test_flush_on_exit(self):
+        post_views.add(self.post.pk)
+        with self.settings(VIEWS_FLUSH_INTERVAL=60):
+            post_views.flush_on_exit()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+    def test_no_flush_on_exit_without_interval(self):
+        post_views.add(self.post.pk)
+        post_views.flush_on_exit()
+        self.assertEqual(post_views.get(self.post.pk), 1)
+
+    def test_failed_flush_keeps_views(self):
+        post_views.add(self.post.pk)
+        with mock.patch(
+            'posts.counters.add_views', side_effect=DatabaseError
+        ), self.assertLogs('posts.counters'):
+            post_views.flush()
+        self.assertEqual(post_views.get(self.post.pk), 1)
+
+    def test_flush_does_not_pin_reader(self):
+        post_views.add(self.post.pk)
+        state = RoutingState()
+        token = routing_state.set(state)
+        try:
+            post_views.flush()
+        finally:
+            routing_state.reset(token)
+        self.assertFalse(state.wrote)
+
+    def test_save_does_not_write_views(self):
+        post = Post.objects.get(pk=self.post.pk)
+        post_views.add(self.post.pk)
+        post_views.flush()
+        post.text = POST_TEXT_EDITED
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.views, 1)
+
+    def test_popular_feed(self):
+        url = reverse('posts:popular')
+        response = self.guest_client.get(url)
+        self.assertEqual(len(response.context['page_obj']), 0)
+        for index, post in enumerate(self.posts):
+            for _ in range(index + 1):
+                post_views.add(post.pk)
+        post_views.flush()
+        response = self.guest_client.get(url)
+        self.assertEqual(
+            list(response.context['page_obj']), self.posts[::-1]
+        )
+        self.assertContains(response, f'Просмотры: {POSTS}')
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+AUTHORS_COUNT = 12
+GROUP_DESCRIPTION = 'Тестовое описание'
+GROUP_SLUG = 'test-slug'
+GROUP_TITLE = 'Тестовая группа'
+POST_TEXT = 'Тестовый пост'
+REVERSE_INDEX = reverse('posts:index')
+
+
+class FeedQueriesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title=GROUP_TITLE,
+            slug=GROUP_SLUG,
+            description=GROUP_DESCRIPTION,
+        )
+        cls.author = User.objects.create_user(username='author')
+        for i in range(AUTHORS_COUNT):
+            Post.objects.create(
+                author=cls.author,
+                text=f'{POST_TEXT} {i}',
+                group=cls.group,
+            )
+        for i in range(AUTHORS_COUNT):
+            Post.objects.create(
+                author=User.objects.create_user(username=f'user{i}'),
+                text=f'{POST_TEXT} {i}',
+                group=Group.objects.create(
+                    title=f'{GROUP_TITLE} {i}',
+                    slug=f'{GROUP_SLUG}-{i}',
+                    description=GROUP_DESCRIPTION,
+                ),
+            )
+        cls.post = Post.objects.latest('pk')
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_feed_query_count(self):
+        pages_queries = {
+            REVERSE_INDEX: 1,
+            reverse('posts:group_list', args=(self.group.slug,)): 2,
+            reverse('posts:profile', args=(self.author,)): 2,
+            reverse('posts:post_detail', args=(self.post.pk,)): 2,
+        }
+        for url, queries in pages_queries.items():
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    self.guest_client.get(url)
+
+    def test_feed_defers_unused_columns(self):
+        post = Post.objects.feed().first()
+        self.assertEqual(
+            post.get_deferred_fields(), {'updated', 'views'}
+        )
+        self.assertIn('description', post.group.get_deferred_fields())
+        self.assertIn('password', post.author.get_deferred_fields())
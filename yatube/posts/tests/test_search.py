@@ -0,0 +1,79 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+
+AUTHOR = 'auth'
+CONTEXT = 'page_obj'
+REVERSE_SEARCH = reverse('posts:search')
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        cls.cat_post = Post.objects.create(
+            author=cls.author,
+            text='Кошка спит на <b>окне</b>',
+        )
+        cls.dog_post = Post.objects.create(
+            author=cls.author,
+            text='Собака гуляет во дворе',
+        )
+        cls.both_post = Post.objects.create(
+            author=cls.author,
+            text='Кошка и собака, кошка и собака',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def search(self, query):
+        response = self.guest_client.get(REVERSE_SEARCH, {'q': query})
+        return list(response.context[CONTEXT])
+
+    def test_search_is_ranked(self):
+        self.assertEqual(
+            self.search('кошка'),
+            [self.both_post, self.cat_post],
+        )
+
+    def test_snippet_is_highlighted_and_escaped(self):
+        post = self.search('окне')[0]
+        self.assertIn('<mark>окне</mark>', post.snippet)
+        self.assertIn('&lt;b&gt;', post.snippet)
+
+    def test_index_follows_updates_and_deletes(self):
+        post = Post.objects.get(pk=self.dog_post.pk)
+        post.text = 'Хомяк грызёт морковку'
+        post.save()
+        self.assertEqual(self.search('хомяк'), [post])
+        self.assertEqual(self.search('гуляет'), [])
+        post.delete()
+        self.assertEqual(self.search('хомяк'), [])
+
+    def test_query_syntax_is_ignored(self):
+        for query in ('', '"', 'NOT', 'кошка OR', '*'):
+            with self.subTest(query=query):
+                response = self.guest_client.get(REVERSE_SEARCH, {'q': query})
+                self.assertEqual(response.status_code, 200)
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO posts_post_fts(posts_post_fts) "
+                "VALUES('delete-all')"
+            )
+        self.assertEqual(self.search('собака'), [])
+        call_command('rebuild_search_index', batch_size=2, stdout=StringIO())
+        self.assertEqual(
+            self.search('собака'),
+            [self.both_post, self.dog_post],
+        )
@@ -0,0 +1,123 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.cache import invalidate
+from posts.cache import (INDEX_FEED, INDEX_SCOPE, LOCK_KEY, get_or_build,
+                         get_page_key)
+from posts.models import Post, User
+
+AUTHOR = 'auth'
+KEY = 'test:stampede'
+POST_TEXT = 'Тестовый пост'
+POST_TEXT_NEW = 'Новый пост'
+
+
+class GetOrBuildTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_builds_once_while_fresh(self):
+        build = mock.Mock(return_value='value')
+        for _ in range(3):
+            self.assertEqual(get_or_build(KEY, build, 60), 'value')
+        build.assert_called_once()
+
+    def test_none_is_not_cached(self):
+        build = mock.Mock(return_value=None)
+        get_or_build(KEY, build, 60)
+        get_or_build(KEY, build, 60)
+        self.assertEqual(build.call_count, 2)
+
+    def test_expired_value_served_while_locked(self):
+        get_or_build(KEY, lambda: 'old', -1)
+        cache.add(LOCK_KEY.format(key=KEY), 1)
+        build = mock.Mock(return_value='new')
+        self.assertEqual(get_or_build(KEY, build, 60), 'old')
+        build.assert_not_called()
+
+    def test_stale_key_served_while_locked(self):
+        get_or_build(KEY, lambda: 'old', 60, stale_key=f'{KEY}:stale')
+        other = f'{KEY}:other'
+        cache.add(LOCK_KEY.format(key=other), 1)
+        build = mock.Mock(return_value='new')
+        self.assertEqual(
+            get_or_build(other, build, 60, stale_key=f'{KEY}:stale'), 'old'
+        )
+        build.assert_not_called()
+
+    def test_expired_value_rebuilt_without_lock(self):
+        get_or_build(KEY, lambda: 'old', -1)
+        self.assertEqual(get_or_build(KEY, lambda: 'new', 60), 'new')
+        self.assertFalse(cache.has_key(LOCK_KEY.format(key=KEY)))
+
+    def test_waits_for_builder(self):
+        cache.add(LOCK_KEY.format(key=KEY), 1)
+        # Другой запрос держит блокировку и вскоре сохраняет значение.
+        timer = threading.Timer(
+            0.1, cache.set, (KEY, ('built', time.time() + 60))
+        )
+        timer.start()
+        build = mock.Mock(return_value='own')
+        try:
+            self.assertEqual(get_or_build(KEY, build, 60), 'built')
+        finally:
+            timer.join()
+        build.assert_not_called()
+
+    def test_stops_waiting_when_lock_released(self):
+        lock_key = LOCK_KEY.format(key=KEY)
+        cache.add(lock_key, 1)
+        # Держатель блокировки отпускает её, не сохранив значения.
+        timer = threading.Timer(0.1, cache.delete, (lock_key,))
+        timer.start()
+        build = mock.Mock(return_value='own')
+        started = time.monotonic()
+        try:
+            with self.settings(FEED_LOCK_WAIT=5):
+                self.assertEqual(get_or_build(KEY, build, 60), 'own')
+        finally:
+            timer.join()
+        self.assertLess(time.monotonic() - started, 1)
+        build.assert_called_once()
+        self.assertFalse(cache.has_key(lock_key))
+
+    def test_builds_itself_after_wait(self):
+        cache.add(LOCK_KEY.format(key=KEY), 1)
+        build = mock.Mock(return_value='own')
+        with self.settings(FEED_LOCK_WAIT=0):
+            self.assertEqual(get_or_build(KEY, build, 60), 'own')
+        build.assert_called_once()
+
+
+class StaleFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username=AUTHOR)
+        Post.objects.create(author=cls.author, text=POST_TEXT)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.url = reverse('posts:index')
+
+    def test_previous_page_served_while_rebuilding(self):
+        old = self.client.get(self.url)
+        Post.objects.create(author=self.author, text=POST_TEXT_NEW)
+        invalidate(INDEX_SCOPE)
+        request = old.wsgi_request
+        key = get_page_key(request, INDEX_FEED)
+        cache.add(LOCK_KEY.format(key=key), 1)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertNotContains(response, POST_TEXT_NEW)
+        self.assertEqual(response['ETag'], old['ETag'])
+        cache.delete(LOCK_KEY.format(key=key))
+        response = self.client.get(self.url)
+        self.assertContains(response, POST_TEXT_NEW)
+        self.assertNotEqual(response['ETag'], old['ETag'])
@@ -1,30 +1,66 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import condition
 
+from core.budget import query_budget
+from core.write_queue import write_queue
+
+from .cache import (GROUP_FEED, GROUPS_SCOPE, INDEX_FEED, POPULAR_FEED,
+                    PROFILE_FEED, PROFILE_SCOPE, USERS_SCOPE, cache_feed,
+                    feed_scopes, get_page_key, make_etag)
+from .counters import count_views, get_posts_count, post_views
+from .exporting import CONTENT_TYPES, export_posts
+from .feeds import get_first_rows
 from .forms import PostForm
 from .models import Group, Post, User
+from .paginators import CursorPaginator, WindowedPaginator
+from .search import SearchResults
+
+POSTS_PER_PAGE = 10
+# Лента, счётчик страниц и сессия с пользователем у авторизованных.
+FEED_QUERY_BUDGET = 4
+AUTOCOMPLETE_LIMIT = 20
+
+
+def get_page_obj(request, post_list, count=None, scopes=None):
+    """Страница ленты; первая берётся из кеша строк ленты ``scopes``."""
+    paginator = CursorPaginator(post_list, POSTS_PER_PAGE, count=count)
+    page, after, before = (
+        request.GET.get(name) for name in ('page', 'after', 'before')
+    )
+    if scopes is not None and not (page or after or before):
+        return paginator.first_page(get_first_rows(
+            scopes, paginator.object_list, POSTS_PER_PAGE + 1
+        ))
+    return paginator.get_page(page, after=after, before=before)
 
 
+@query_budget(FEED_QUERY_BUDGET)
+@cache_feed(*INDEX_FEED)
 def index(request):
     template = 'posts/index.html'
-    post_list = Post.objects.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = Post.objects.feed()
+    page_obj = get_page_obj(request, post_list, scopes=INDEX_FEED)
     context = {
         'page_obj': page_obj,
     }
     return render(request, template, context)
 
 
+@query_budget(FEED_QUERY_BUDGET)
+@cache_feed(*GROUP_FEED)
 def group_posts(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.groups.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = Post.objects.feed().filter(group=group)
+    page_obj = get_page_obj(
+        request, post_list, group.posts_count,
+        feed_scopes(GROUP_FEED, slug=group.slug),
+    )
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -32,29 +68,128 @@ def group_posts(request, slug):
     return render(request, template, context)
 
 
+@query_budget(FEED_QUERY_BUDGET)
+@cache_feed(*PROFILE_FEED)
 def profile(request, username):
     template = 'posts/profile.html'
-    username = get_object_or_404(User, username=username)
-    post_list = username.posts.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    username = get_object_or_404(
+        User.objects.select_related('stats'),
+        username=username,
+    )
+    posts_count = get_posts_count(username)
+    post_list = Post.objects.feed().filter(author=username)
+    page_obj = get_page_obj(
+        request, post_list, posts_count,
+        feed_scopes(PROFILE_FEED, username=username.username),
+    )
     context = {
         'username': username,
         'page_obj': page_obj,
+        'posts_count': posts_count,
     }
     return render(request, template, context)
 
 
+def post_etag(request, post_id):
+    post = Post.objects.filter(pk=post_id).values_list(
+        'updated', 'author__username'
+    ).first()
+    if post is None:
+        return None
+    updated, username = post
+    scopes = (
+        PROFILE_SCOPE.format(username=username), GROUPS_SCOPE, USERS_SCOPE
+    )
+    return make_etag(get_page_key(request, scopes), updated.isoformat())
+
+
+@count_views
+@query_budget(FEED_QUERY_BUDGET)
+@condition(etag_func=post_etag)
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    page_obj = get_object_or_404(Post, id=post_id)
+    page_obj = get_object_or_404(
+        Post.objects.select_related('author__stats', 'group'),
+        id=post_id,
+    )
+    context = {
+        'page_obj': page_obj,
+        'posts_count': get_posts_count(page_obj.author),
+        'views': page_obj.views + post_views.get(page_obj.pk),
+    }
+    return render(request, template, context)
+
+
+@query_budget(FEED_QUERY_BUDGET)
+@cache_feed(*POPULAR_FEED)
+def popular(request):
+    template = 'posts/popular.html'
+    paginator = WindowedPaginator(Post.objects.popular(), POSTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, template, context)
+
+
+def search(request):
+    template = 'posts/search.html'
+    query = request.GET.get('q', '').strip()
+    paginator = WindowedPaginator(SearchResults(query), POSTS_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
     context = {
+        'query': query,
         'page_obj': page_obj,
     }
     return render(request, template, context)
 
 
+def group_autocomplete(request):
+    query = request.GET.get('q', '').strip()
+    groups = Group.objects.none()
+    if query:
+        groups = Group.objects.filter(title__icontains=query)
+    results = groups.order_by('title').values('id', 'title')
+    return JsonResponse({'results': list(results[:AUTOCOMPLETE_LIMIT])})
+
+
+def export_response(fmt, name, **scope):
+    if fmt not in CONTENT_TYPES:
+        raise Http404
+    response = StreamingHttpResponse(
+        export_posts(fmt, **scope),
+        content_type=CONTENT_TYPES[fmt],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{name}.{fmt}"'
+    )
+    return response
+
+
+@staff_member_required
+def export_all(request, fmt):
+    return export_response(fmt, 'posts')
+
+
+def export_group(request, slug, fmt):
+    group = get_object_or_404(Group, slug=slug)
+    return export_response(fmt, f'group-{group.slug}', group=group)
+
+
+def export_profile(request, username, fmt):
+    author = get_object_or_404(User, username=username)
+    return export_response(fmt, f'profile-{author.username}', author=author)
+
+
+def save_post(post):
+    """Сохраняет пост через очередь записей, если она включена."""
+    if settings.WRITE_QUEUE_ENABLED:
+        write_queue.submit(post.save)
+    else:
+        with transaction.atomic():
+            post.save()
+
+
 @login_required
 def post_create(request):
     template = 'posts/create_post.html'
@@ -66,13 +201,14 @@ def post_create(request):
             author = request.user
             form = form.save(commit=False)
             form.author_id = author.id
-            form.save()
+            save_post(form)
             return redirect('posts:profile', username=author)
 
     return render(request, template, {'form': form})
 
 
 @login_required
+@transaction.atomic
 def post_edit(request, post_id):
     template = 'posts/create_post.html'
     post = get_object_or_404(Post, id=post_id)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from core.cache import get_versions
+
+USER_SCOPE = 'user:{pk}'
+USER_KEY = 'auth:user:{version}:{pk}'
+
+
+def get_user_key(user_id):
+    (version,) = get_versions([USER_SCOPE.format(pk=user_id)])
+    return USER_KEY.format(version=version, pk=user_id)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кеша.
+
+    Запись сбрасывается при любом сохранении или удалении пользователя,
+    в том числе при смене пароля.
+    """
+
+    def get_user(self, user_id):
+        key = get_user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+from users.backends import CachedModelBackend
+
+FIRST_NAME = 'Иван'
+REVERSE_INDEX = reverse('posts:index')
+
+
+class CachedModelBackendTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.backend = CachedModelBackend()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_warm_authenticated_index_runs_no_queries(self):
+        self.authorized_client.get(REVERSE_INDEX)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(REVERSE_INDEX)
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_is_cached(self):
+        self.backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+
+    def test_cache_is_reset_on_save(self):
+        self.backend.get_user(self.user.pk)
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = FIRST_NAME
+        user.save()
+        self.assertEqual(
+            self.backend.get_user(self.user.pk).first_name, FIRST_NAME
+        )
+
+    def test_password_change_ends_cached_session(self):
+        self.authorized_client.get(REVERSE_INDEX)
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password('new-password-123')
+        user.save()
+        response = self.authorized_client.get(reverse('posts:post_create'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_session_from_model_backend_stays_logged_in(self):
+        client = Client()
+        client.force_login(
+            self.user, backend='django.contrib.auth.backends.ModelBackend'
+        )
+        response = client.get(reverse('posts:post_create'))
+        self.assertEqual(response.status_code, 200)
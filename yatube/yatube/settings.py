@@ -1,8 +1,11 @@
 import os
+import sys
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SECRET_KEY = '4z3hf_6fra2j&w1d@fuc@ct3(hgtg=14zb34_xw@=_+=q)at3w'
 DEBUG = True
+# Тесты запускаются и через manage.py test, и через py.test.
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
 ALLOWED_HOSTS = [
     'localhost',
     '127.0.0.1',
@@ -23,8 +26,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.routers.ReplicaPinningMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -37,7 +43,7 @@ ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -54,11 +60,110 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+# Общий для всех воркеров хоста кеш в файле, отображённом в память.
+CACHE_PATH = os.environ.get('CACHE_PATH')
+if CACHE_PATH:
+    CACHES['default'] = {
+        'BACKEND': 'core.mmap_cache.MmapCache',
+        'LOCATION': CACHE_PATH,
+        'OPTIONS': {
+            'MAX_SIZE': 128 * 1024 * 1024,
+            'MAX_ENTRIES': 50000,
+        },
+    }
+FEED_CACHE_TIMEOUT = 60 * 15
+# Сколько отдавать устаревшую страницу, пока её перестраивает
+# другой запрос, и сколько держать блокировку перестроения.
+FEED_STALE_TIMEOUT = 60 * 5
+FEED_LOCK_TIMEOUT = 30
+FEED_LOCK_WAIT = 5
+# Просмотры постов копятся в памяти и сбрасываются в базу пачкой;
+# в тестах — только явным вызовом flush.
+VIEWS_FLUSH_INTERVAL = None if TESTING else 10
+USER_CACHE_TIMEOUT = 60 * 60
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# В тестах выборка выключена, чтобы JSON-строки не попадали в вывод.
+INSTRUMENTATION_SAMPLE_RATE = 0 if TESTING else 0.01
+
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_INTERVAL = 5
+METRICS_ALLOWED_IPS = ('127.0.0.1', '::1')
+
+QUERY_BUDGET_STRICT = DEBUG or TESTING
+
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'slow_queries.log')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG,
+            'maxBytes': 5 * 1024 * 1024,
+            'backupCount': 3,
+            'encoding': 'utf-8',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'core': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'core.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
+    }
+}
+REPLICA_PATHS = [
+    path for path in os.environ.get('DATABASE_REPLICAS', '').split(',')
+    if path
+]
+DATABASE_REPLICAS = [
+    f'replica_{index}' for index in range(len(REPLICA_PATHS))
+]
+DATABASES.update({
+    alias: {
+        **DATABASES['default'],
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
     }
+    for alias, path in zip(DATABASE_REPLICAS, REPLICA_PATHS)
+})
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = 15
+# Создание постов через один поток-писатель, коммитящий пачками.
+WRITE_QUEUE_ENABLED = bool(os.environ.get('WRITE_QUEUE'))
+WRITE_QUEUE_BATCH_SIZE = 50
+WRITE_QUEUE_TIMEOUT = 10
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -85,6 +190,11 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 
+# ModelBackend остаётся для сессий, открытых до кеширования пользователей.
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 